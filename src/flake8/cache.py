@@ -0,0 +1,330 @@
+"""Caches of per-file check results."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import tempfile
+from collections.abc import Sequence
+from typing import Any
+from typing import Optional
+
+import flake8
+from flake8.plugins.finder import Checkers
+from flake8.plugins.finder import LoadedPlugin
+
+LOG = logging.getLogger(__name__)
+
+Results = list[tuple[str, int, int, str, Optional[str]]]
+FileResult = tuple[str, Results, dict[str, int]]
+
+# options which only change how files are found or how results are filtered
+# and displayed -- they never change what a plugin reports for a file.  The
+# selected codes are not among them: they decide which checks are run
+_OPTIONS_NOT_AFFECTING_CHECKS = frozenset(
+    [
+        "append_config",
+        "benchmark",
+        "benchmark_json",
+        "bug_report",
+        "cache_dir",
+        "changed_since",
+        "color",
+        "config",
+        "count",
+        "daemon",
+        "exclude",
+        "executor",
+        "exit_zero",
+        "extend_exclude",
+        "filename",
+        "filenames",
+        "format",
+        "isolated",
+        "jobs",
+        "max_violations",
+        "output_file",
+        "per_file_ignores",
+        "profile_plugins",
+        "quiet",
+        "reorder_buffer",
+        "respect_gitignore",
+        "show_source",
+        "slowest",
+        "statistics",
+        "stream_results",
+        "tee",
+        "watch",
+        "worker_max_files",
+        "worker_max_memory",
+    ],
+)
+# with ``--filter-in-workers`` the cached results are already filtered
+_OPTIONS_FILTERING_RESULTS = frozenset(["per_file_ignores"])
+
+
+def _local_source_digest(loaded: LoadedPlugin) -> str:
+    """Hash the source of a local plugin, which has no version to go by."""
+    try:
+        with open(inspect.getfile(loaded.obj), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except (OSError, TypeError):
+        return ""
+
+
+def _fingerprint(plugins: Checkers, options: argparse.Namespace) -> bytes:
+    """Fingerprint everything besides file contents that affects results."""
+    checkers = (*plugins.tree, *plugins.logical_line, *plugins.physical_line)
+    plugin_versions = sorted(
+        f"{loaded.plugin.package}=={loaded.plugin.version}:"
+        f"{loaded.plugin.entry_point.value}"
+        + (
+            f":{_local_source_digest(loaded)}"
+            if loaded.plugin.package == "local"
+            else ""
+        )
+        for loaded in checkers
+    )
+    ignored = _OPTIONS_NOT_AFFECTING_CHECKS
+    if options.filter_in_workers:
+        ignored -= _OPTIONS_FILTERING_RESULTS
+    checked_options = {
+        name: repr(value)
+        for name, value in vars(options).items()
+        if name not in ignored
+    }
+    return json.dumps(
+        {
+            "flake8": flake8.__version__,
+            "python": sys.version,
+            "plugins": plugin_versions,
+            "options": checked_options,
+        },
+        sort_keys=True,
+    ).encode()
+
+
+class ResultCache:
+    """Store the results of checking a file keyed by its contents.
+
+    The key for each entry combines the file name, the file's contents, the
+    versions of the installed plugins, the version of python and every
+    option which may affect what the plugins report.  Entries are stored as
+    individual JSON files inside ``cache_dir`` so that concurrent runs never
+    observe a partially written entry.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        plugins: Checkers,
+        options: argparse.Namespace,
+        max_size: int,
+    ) -> None:
+        """Initialize the cache.
+
+        :param cache_dir:
+            Directory where cache entries are stored.
+        :param max_size:
+            Size in bytes that the cache is pruned to by :meth:`prune`.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._prefix = hashlib.sha256(_fingerprint(plugins, options)).digest()
+        self._keys: dict[str, str] = {}
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _key_for(self, filename: str) -> str | None:
+        try:
+            with open(filename, "rb") as f:
+                contents = f.read()
+        except OSError:
+            # the file checker will report this as E902
+            return None
+
+        digest = hashlib.sha256(self._prefix)
+        digest.update(os.fsencode(filename))
+        digest.update(b"\0")
+        digest.update(contents)
+        return digest.hexdigest()
+
+    def get(self, filename: str) -> FileResult | None:
+        """Retrieve the cached results for a file, if any."""
+        if filename == "-":
+            return None
+
+        key = self._key_for(filename)
+        if key is None:
+            return None
+        self._keys[filename] = key
+
+        path = self._path_for(key)
+        try:
+            with open(path, encoding="UTF-8") as f:
+                entry = json.load(f)
+            # mark the entry as recently used for pruning
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        results: Results = [
+            (code, row, col, text, line)
+            for code, row, col, text, line in entry["results"]
+        ]
+        return entry["display_name"], results, entry["statistics"]
+
+    def partition(
+        self, filenames: Sequence[str],
+    ) -> tuple[dict[str, FileResult], tuple[str, ...]]:
+        """Split filenames into cached results and files to be checked."""
+        cached = {}
+        uncached = []
+        for filename in filenames:
+            result = self.get(filename)
+            if result is None:
+                uncached.append(filename)
+            else:
+                cached[filename] = result
+        return cached, tuple(uncached)
+
+    def set(self, filename: str, result: FileResult) -> None:
+        """Store the results of checking a file seen by :meth:`get`."""
+        key = self._keys.get(filename)
+        if key is None:
+            return
+
+        display_name, results, statistics = result
+        entry: dict[str, Any] = {
+            "display_name": display_name,
+            "results": results,
+            "statistics": statistics,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="UTF-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path_for(key))
+        except OSError as e:
+            LOG.warning("could not write cache entry for %s: %s", filename, e)
+
+    def prune(self) -> None:
+        """Evict the least recently used entries above ``max_size``."""
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".json")
+            ]
+        except OSError:
+            return
+
+        stats = []
+        for entry in entries:
+            try:
+                stats.append((entry.stat(), entry.path))
+            except OSError:
+                continue
+        stats.sort(key=lambda st: st[0].st_mtime, reverse=True)
+
+        size = 0
+        for st, path in stats:
+            size += st.st_size
+            if size > self.max_size:
+                LOG.debug("evicting cache entry %s", path)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+_Signature = Optional[tuple[int, int, int]]
+
+
+class StatCache:
+    """Keep the results of checking a file in memory while it is unchanged.
+
+    This is used by ``--watch``: a file is considered unchanged as long as
+    its modification time, size and inode are the same.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[_Signature, FileResult]] = {}
+        # the signatures of the files seen by the last check
+        self._signatures: dict[str, _Signature] = {}
+
+    @staticmethod
+    def _signature_for(filename: str) -> _Signature:
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        else:
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def changed(self, filenames: Sequence[str]) -> bool:
+        """Whether any file was added, removed or modified.
+
+        This compares with the files seen by the last check, including the
+        ones without results (e.g. when it stopped early).
+        """
+        if self._signatures.keys() != set(filenames):
+            return True
+        return any(
+            self._signature_for(filename) != signature
+            for filename, signature in self._signatures.items()
+        )
+
+    def get(self, filename: str) -> FileResult | None:
+        """Retrieve the results for a file if it has not changed."""
+        if filename == "-":
+            return None
+
+        signature = self._signature_for(filename)
+        self._signatures[filename] = signature
+
+        entry = self._entries.get(filename)
+        if entry is None or entry[0] != signature:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[1]
+
+    def partition(
+        self, filenames: Sequence[str],
+    ) -> tuple[dict[str, FileResult], tuple[str, ...]]:
+        """Split filenames into cached results and files to be checked."""
+        self._signatures = {}
+        cached = {}
+        uncached = []
+        for filename in filenames:
+            result = self.get(filename)
+            if result is None:
+                uncached.append(filename)
+            else:
+                cached[filename] = result
+        return cached, tuple(uncached)
+
+    def set(self, filename: str, result: FileResult) -> None:
+        """Store the results of checking a file seen by :meth:`get`."""
+        if filename in self._signatures:
+            self._entries[filename] = (self._signatures[filename], result)
+
+    def prune(self) -> None:
+        """Forget the files which were not seen by the last check."""
+        for filename in self._entries.keys() - self._signatures.keys():
+            del self._entries[filename]
@@ -2,31 +2,66 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import collections
 import contextlib
 import errno
+import itertools
 import logging
 import multiprocessing.pool
 import operator
+import os
+import pickle
+import queue
 import signal
+import sys
+import time
 import tokenize
+from collections.abc import Callable
 from collections.abc import Generator
 from collections.abc import Sequence
 from typing import Any
 from typing import Optional
 
+from flake8 import cache
 from flake8 import defaults
 from flake8 import exceptions
 from flake8 import processor
 from flake8 import utils
 from flake8._compat import FSTRING_START
 from flake8._compat import TSTRING_START
+from flake8.discover_files import DirectoryListings
 from flake8.discover_files import expand_paths
+from flake8.formatting.default import Default
+from flake8.options.parse_args import load_run_plan
+from flake8.options.parse_args import make_run_plan
 from flake8.options.parse_args import parse_args
+from flake8.options.parse_args import RunPlan
+from flake8.plugins import reporter
 from flake8.plugins.finder import Checkers
 from flake8.plugins.finder import LoadedPlugin
+from flake8.plugins.finder import prune_checkers
 from flake8.style_guide import StyleGuideManager
 
+try:
+    import resource
+except ImportError:  # pragma: win32 cover
+    resource = None  # type: ignore[assignment]
+
 Results = list[tuple[str, int, int, str, Optional[str]]]
+_FileResult = tuple[str, Results, dict[str, int]]
+# (plugin display name, check type) => [seconds, calls]
+_Timings = dict[tuple[str, str], list[float]]
+# (filename, result, seconds spent checking, plugin timings)
+_CheckedFile = tuple[str, _FileResult, float, Optional[_Timings]]
+# (worker pid, whether the worker should be recycled, checked files)
+_ChunkResult = tuple[int, bool, list[_CheckedFile]]
+
+# calls a plugin with the ``tree`` / ``logical_line`` / ``physical_line``
+_Call = Callable[[Any], Any]
+
+# statistic recording the results dropped by ``--filter-in-workers``
+_FILTERED = "filtered results"
 
 LOG = logging.getLogger(__name__)
 
@@ -45,16 +80,41 @@ SERIAL_RETRY_ERRNOS = {
     # noise in diffs.
 }
 
-_mp: tuple[Checkers, argparse.Namespace] | None = None
+# estimates of the cost of checking files (in bytes of source) used when
+# scheduling work for the process pool
+_FILE_COST = 1024
+_MIN_CHUNK_COST = 32 * 1024
+
+_mp: tuple[Checkers, argparse.Namespace, StyleGuideManager] | None = None
+# the resident set size of a worker once it is initialized
+_rss_at_start = 0
+
+
+def _has_attribute(obj: object, name: str) -> bool:
+    # unlike ``hasattr`` this does not compute cached properties
+    return name in vars(obj) or hasattr(type(obj), name)
+
+
+def _attrs_getter(names: Sequence[str]) -> Callable[[Any], tuple[Any, ...]]:
+    """Return a function reading the attributes ``names`` as a tuple."""
+    if not names:
+        return lambda _: ()
+    elif len(names) == 1:
+        (name,) = names
+        return lambda obj: (getattr(obj, name),)
+    else:
+        return operator.attrgetter(*names)
 
 
 @contextlib.contextmanager
 def _mp_prefork(
-    plugins: Checkers, options: argparse.Namespace,
+    plugins: Checkers,
+    options: argparse.Namespace,
+    style_guide: StyleGuideManager,
 ) -> Generator[None]:
     # we can save significant startup work w/ `fork` multiprocessing
     global _mp
-    _mp = plugins, options
+    _mp = plugins, options, style_guide
     try:
         yield
     finally:
@@ -62,7 +122,7 @@ def _mp_prefork(
 
 
 def _mp_init(argv: Sequence[str]) -> None:
-    global _mp
+    global _mp, _rss_at_start
 
     # Ensure correct signaling of ^C using multiprocessing.Pool.
     signal.signal(signal.SIGINT, signal.SIG_IGN)
@@ -70,15 +130,89 @@ def _mp_init(argv: Sequence[str]) -> None:
     # for `fork` this'll already be set
     if _mp is None:
         plugins, options = parse_args(argv)
-        _mp = plugins.checkers, options
+        formatter = reporter.make(plugins.reporters, options)
+        _mp = plugins.checkers, options, StyleGuideManager(options, formatter)
+
+    _rss_at_start = _rss()
+
+
+def _mp_init_plan(plan: RunPlan) -> None:
+    global _mp, _rss_at_start
+
+    # Ensure correct signaling of ^C using multiprocessing.Pool.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # for `fork` this'll already be set
+    if _mp is None:
+        checkers, options = load_run_plan(plan)
+        # the workers never report anything themselves
+        formatter = Default(options)
+        _mp = checkers, options, StyleGuideManager(options, formatter)
+
+    _rss_at_start = _rss()
+
+
+def _check_file(
+    filename: str, plugins: Checkers, options: argparse.Namespace,
+) -> _CheckedFile:
+    start = time.perf_counter()
+    checker = FileChecker(filename=filename, plugins=plugins, options=options)
+    result = checker.run_checks()
+    elapsed = time.perf_counter() - start
+    return filename, result, elapsed, checker.timings
+
+
+def _peak_rss() -> int:
+    """Return the peak resident set size of this process in bytes."""
+    if resource is None:  # pragma: win32 cover
+        return 0
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux and most unixes report KiB, macos reports bytes
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _rss() -> int:
+    """Return the resident set size of this process in bytes.
+
+    The peak size is used where the current size is not available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except OSError:  # pragma: linux no cover
+        return _peak_rss()
+    else:
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _rss_growth() -> int:
+    """Return how much the resident set size grew since the pool started.
+
+    A forked worker starts with the memory (and the peak) of the main
+    process so only its growth is compared to ``--worker-max-memory``.
+    """
+    return _rss() - _rss_at_start
+
+
+def _filter_checked(
+    checked: _CheckedFile, style_guide: StyleGuideManager,
+) -> _CheckedFile:
+    """Drop the results which would not be reported from a checked file."""
+    filename, (display_name, results, statistics), elapsed, timings = checked
+    reported = style_guide.filter_results(display_name, results)
+    statistics[_FILTERED] = len(results) - len(reported)
+    return filename, (display_name, reported, statistics), elapsed, timings
 
 
-def _mp_run(filename: str) -> tuple[str, Results, dict[str, int]]:
+def _mp_run_chunk(filenames: Sequence[str]) -> _ChunkResult:
     assert _mp is not None, _mp
-    plugins, options = _mp
-    return FileChecker(
-        filename=filename, plugins=plugins, options=options,
-    ).run_checks()
+    plugins, options, style_guide = _mp
+    checked = [_check_file(f, plugins, options) for f in filenames]
+    if options.filter_in_workers:
+        checked = [_filter_checked(c, style_guide) for c in checked]
+    max_memory = options.worker_max_memory * 1024 * 1024
+    over_memory = max_memory > 0 and _rss_growth() > max_memory
+    return os.getpid(), over_memory, checked
 
 
 class Manager:
@@ -109,7 +243,13 @@ class Manager:
         """Initialize our Manager instance."""
         self.style_guide = style_guide
         self.options = style_guide.options
-        self.plugins = plugins
+        # plugins whose codes are all ignored would only waste time
+        self.plugins = prune_checkers(plugins, style_guide.decider.selects_any)
+        #: whether the files are tokenized, which counts the tokens and the
+        #: logical lines
+        self.needs_tokens = bool(
+            self.plugins.logical_line or self.plugins.physical_line,
+        )
         self.jobs = self._job_count()
         self.statistics = {
             "files": 0,
@@ -119,13 +259,39 @@ class Manager:
         }
         self.exclude = (*self.options.exclude, *self.options.extend_exclude)
         self.argv = argv
-        self.results: list[tuple[str, Results, dict[str, int]]] = []
+        self.results: list[_FileResult] = []
+        self.results_found = self.results_reported = 0
+        #: whether results are reported while the checks are running
+        self.streaming = (
+            self.options.stream_results or self.options.max_violations > 0
+        )
+        self.cache: cache.ResultCache | cache.StatCache | None = None
+        #: the directories walked by the last check with ``--watch``
+        self.listings = DirectoryListings() if self.options.watch else None
+        self.cached_results: dict[str, _FileResult] = {}
+        self._stream_order: collections.deque[str] = collections.deque()
+        self._stream_pending: dict[str, _FileResult] = {}
+        self._stream_reported: set[str] = set()
+        #: (plugin display name, check type) => [seconds, calls, files] with
+        #: ``--profile-plugins``
+        self.plugin_timings: dict[tuple[str, str], list[float]] = {}
+        #: (seconds, filename, statistics) for each checked file with
+        #: ``--slowest``
+        self.file_times: list[tuple[float, str, dict[str, int]]] = []
+        #: the number of worker processes replaced by new ones because of
+        #: ``--worker-max-files`` or ``--worker-max-memory``
+        self.workers_recycled = 0
+        #: seconds spent in the phases of the run timed by the manager
+        self.phase_times: dict[str, float] = {}
+
+    def _add_statistics(self, statistics: dict[str, int]) -> None:
+        for statistic in defaults.STATISTIC_NAMES:
+            self.statistics[statistic] += statistics[statistic]
+        self.statistics["files"] += 1
 
     def _process_statistics(self) -> None:
         for _, _, statistics in self.results:
-            for statistic in defaults.STATISTIC_NAMES:
-                self.statistics[statistic] += statistics[statistic]
-        self.statistics["files"] += len(self.filenames)
+            self._add_statistics(statistics)
 
     def _job_count(self) -> int:
         # First we walk through all of our error cases:
@@ -171,36 +337,150 @@ class Manager:
             )
         return reported_results_count
 
+    def _report_file(self, result: _FileResult) -> None:
+        filename, results, statistics = result
+        results.sort(key=operator.itemgetter(1, 2))
+        with self.style_guide.processing_file(filename):
+            self.results_reported += self._handle_results(filename, results)
+        # results the workers did not send back still count as found
+        self.results_found += len(results) + statistics.get(_FILTERED, 0)
+
+    def _stream_result(self, filename: str, result: _FileResult) -> None:
+        """Report the results for a file as soon as possible.
+
+        Results are held back until every file sorted before it has been
+        reported, unless more than ``--reorder-buffer`` files are waiting in
+        which case the first of those is reported immediately.
+        """
+        self._add_statistics(result[2])
+        self._stream_pending[filename] = result
+
+        order = self._stream_order
+        while order and (
+            order[0] in self._stream_pending
+            or order[0] in self._stream_reported
+        ):
+            filename = order.popleft()
+            if filename in self._stream_pending:
+                self._report_file(self._stream_pending.pop(filename))
+            else:
+                self._stream_reported.remove(filename)
+
+        while len(self._stream_pending) > self.options.reorder_buffer:
+            filename = min(self._stream_pending)
+            self._report_file(self._stream_pending.pop(filename))
+            self._stream_reported.add(filename)
+
+    def _add_result(self, filename: str, result: _FileResult) -> None:
+        if self.streaming:
+            with utils.timed(self.phase_times, "reporting"):
+                self._stream_result(filename, result)
+        else:
+            self.results.append(result)
+
+    def _add_timings(self, timings: _Timings) -> None:
+        for key, (seconds, calls) in timings.items():
+            total = self.plugin_timings.setdefault(key, [0.0, 0, 0])
+            total[0] += seconds
+            total[1] += calls
+            total[2] += 1
+
+    def _file_checked(
+        self,
+        filename: str,
+        result: _FileResult,
+        elapsed: float,
+        timings: _Timings | None,
+    ) -> None:
+        if self.cache is not None:
+            self.cache.set(filename, result)
+        if timings is not None:
+            self._add_timings(timings)
+        if self.options.slowest:
+            display_name, _, statistics = result
+            self.file_times.append((elapsed, display_name, statistics))
+        self._add_result(filename, result)
+
+    def _enough_violations(self) -> bool:
+        max_violations = self.options.max_violations
+        return max_violations > 0 and self.results_reported >= max_violations
+
     def report(self) -> tuple[int, int]:
         """Report all of the errors found in the managed file checkers.
 
         This iterates over each of the checkers and reports the errors sorted
-        by line number.
+        by line number.  With ``--stream-results`` most files will already
+        have been reported while the checks were running.
 
         :returns:
             A tuple of the total results found and the results reported.
         """
-        results_reported = results_found = 0
         self.results.sort(key=operator.itemgetter(0))
-        for filename, results, _ in self.results:
-            results.sort(key=operator.itemgetter(1, 2))
-            with self.style_guide.processing_file(filename):
-                results_reported += self._handle_results(filename, results)
-            results_found += len(results)
-        return (results_found, results_reported)
-
-    def run_parallel(self) -> None:
-        """Run the checkers in parallel."""
-        with _mp_prefork(self.plugins, self.options):
-            pool = _try_initialize_processpool(self.jobs, self.argv)
+        for result in self.results:
+            self._report_file(result)
+        return (self.results_found, self.results_reported)
+
+    def _chunks(self) -> list[tuple[str, ...]]:
+        if self.options.max_violations or self.options.worker_max_files:
+            # stopping early (or recycling workers after an exact number of
+            # files) matters more than the overhead of sending each file to
+            # the workers separately
+            return [(filename,) for filename in self.filenames]
+        else:
+            return _schedule(self.filenames, self.jobs)
 
-        if pool is None:
-            self.run_serial()
-            return
+    def _run_pool(
+        self,
+        pool: multiprocessing.pool.Pool,
+        run_chunk: Callable[[Sequence[str]], _ChunkResult],
+        new_pool: Callable[[], multiprocessing.pool.Pool] | None = None,
+    ) -> None:
+        """Run the chunks of files in ``pool``.
 
+        Only a few chunks are queued at a time so that the pool can be
+        replaced using ``new_pool`` when a worker asks to be recycled, and
+        so that no more work is queued than needed with --max-violations.
+        """
+        chunks = collections.deque(self._chunks())
+        done: queue.SimpleQueue[_ChunkResult | BaseException]
+        done = queue.SimpleQueue()
+        in_flight = 0
+        recycle = False
+        # the workers which checked files in the current pool
+        pids = set()
         pool_closed = False
         try:
-            self.results = list(pool.imap_unordered(_mp_run, self.filenames))
+            while chunks or in_flight:
+                while chunks and not recycle and in_flight < self.jobs * 2:
+                    pool.apply_async(
+                        run_chunk,
+                        (chunks.popleft(),),
+                        callback=done.put,
+                        error_callback=done.put,
+                    )
+                    in_flight += 1
+
+                ret = done.get()
+                in_flight -= 1
+                if isinstance(ret, BaseException):
+                    raise ret
+                pid, over_memory, checked = ret
+                pids.add(pid)
+                for checked_file in checked:
+                    self._file_checked(*checked_file)
+                if self._enough_violations():
+                    LOG.info("Reached --max-violations, stopping early")
+                    return  # the pool is terminated below
+                recycle = recycle or over_memory
+
+                if recycle and chunks and not in_flight and new_pool:
+                    LOG.info("Recycling workers over --worker-max-memory")
+                    pool.close()
+                    pool.join()
+                    pool = new_pool()
+                    recycle = False
+                    self.workers_recycled += len(pids)
+                    pids.clear()
             pool.close()
             pool.join()
             pool_closed = True
@@ -208,17 +488,84 @@ class Manager:
             if not pool_closed:
                 pool.terminate()
                 pool.join()
+            # with --worker-max-files the pool replaces its workers itself
+            self.workers_recycled += max(len(pids) - self.jobs, 0)
+
+    def _run_chunk(self, filenames: Sequence[str]) -> _ChunkResult:
+        checked = [
+            _check_file(filename, self.plugins, self.options)
+            for filename in filenames
+        ]
+        return os.getpid(), False, checked
+
+    def _thread_unsafe_plugins(self) -> list[str]:
+        return [
+            loaded.display_name
+            for loaded in itertools.chain.from_iterable(self.plugins)
+            if not loaded.thread_safe
+        ]
+
+    def _run_plan(self) -> RunPlan | None:
+        if multiprocessing.get_start_method() == "fork":
+            # the workers inherit the plugins and options
+            return None
+
+        plan = make_run_plan(self.plugins, self.options)
+        try:
+            pickle.dumps(plan)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            LOG.debug("workers will parse the arguments again: %s", e)
+            return None
+        else:
+            return plan
+
+    def _new_process_pool(self) -> multiprocessing.pool.Pool | None:
+        with utils.timed(self.phase_times, "pool startup"):
+            return _try_initialize_processpool(
+                self.jobs,
+                self.argv,
+                maxtasksperchild=self.options.worker_max_files or None,
+                plan=self._run_plan(),
+            )
+
+    def run_parallel(self) -> None:
+        """Run the checkers in parallel.
+
+        The plugins and options are shared with the workers for the whole
+        run so that recycled workers also start from a cheap ``fork``.
+        """
+        with _mp_prefork(self.plugins, self.options, self.style_guide):
+            pool = self._new_process_pool()
+            if pool is None:
+                self.run_serial()
+                return
+
+            def new_pool() -> multiprocessing.pool.Pool:
+                pool = self._new_process_pool()
+                assert pool is not None
+                return pool
+
+            self._run_pool(pool, _mp_run_chunk, new_pool)
+
+    def run_threaded(self) -> None:
+        """Run the checkers in parallel using a pool of threads.
+
+        Unlike :meth:`run_parallel` this shares the loaded plugins between
+        the workers and does not need to send the results between processes.
+        This is only faster on free-threaded builds of python.
+        """
+        pool = multiprocessing.pool.ThreadPool(self.jobs)
+        self._run_pool(pool, self._run_chunk)
 
     def run_serial(self) -> None:
         """Run the checkers in serial."""
-        self.results = [
-            FileChecker(
-                filename=filename,
-                plugins=self.plugins,
-                options=self.options,
-            ).run_checks()
-            for filename in self.filenames
-        ]
+        for filename in self.filenames:
+            if self._enough_violations():
+                LOG.info("Reached --max-violations, stopping early")
+                return
+            self._file_checked(
+                *_check_file(filename, self.plugins, self.options),
+            )
 
     def run(self) -> None:
         """Run all the checkers.
@@ -229,36 +576,93 @@ class Manager:
         If running the checks in parallel causes a problem (e.g.,
         :issue:`117`) this also implements fallback to serial processing.
         """
+        for filename, result in self.cached_results.items():
+            self._add_result(filename, result)
+
+        executor = self.options.executor
+        if executor == "thread":
+            thread_unsafe = self._thread_unsafe_plugins()
+            if thread_unsafe:
+                LOG.warning(
+                    "Using --executor=process since these plugins are not "
+                    "thread safe: %s",
+                    ", ".join(thread_unsafe),
+                )
+                executor = "process"
+
+        parallel = self.jobs > 1 and len(self.filenames) > 1
         try:
-            if self.jobs > 1 and len(self.filenames) > 1:
+            if self._enough_violations():
+                LOG.info("Reached --max-violations with cached results")
+            elif parallel and executor == "process":
                 self.run_parallel()
+            elif parallel and executor == "thread":
+                self.run_threaded()
             else:
                 self.run_serial()
         except KeyboardInterrupt:
             LOG.warning("Flake8 was interrupted by the user")
             raise exceptions.EarlyQuit("Early quit while running checks")
 
-    def start(self) -> None:
-        """Start checking files.
+        # anything still waiting in the reorder buffer is reported in order
+        with utils.timed(self.phase_times, "reporting"):
+            for filename in sorted(self._stream_pending):
+                self._report_file(self._stream_pending.pop(filename))
 
-        :param paths:
-            Path names to check. This is passed directly to
-            :meth:`~Manager.make_checkers`.
-        """
-        LOG.info("Making checkers")
-        self.filenames = tuple(
+    def find_filenames(self) -> tuple[str, ...]:
+        """Find the files to check from the paths given by the user."""
+        filenames = tuple(
             expand_paths(
                 paths=self.options.filenames,
                 stdin_display_name=self.options.stdin_display_name,
                 filename_patterns=self.options.filename,
                 exclude=self.exclude,
+                changed_since=self.options.changed_since,
+                respect_gitignore=self.options.respect_gitignore,
+                listings=self.listings,
             ),
         )
+        if self.listings is not None:
+            self.listings.prune()
+        return filenames
+
+    def start(self) -> None:
+        """Start checking files.
+
+        :param paths:
+            Path names to check. This is passed directly to
+            :meth:`~Manager.make_checkers`.
+        """
+        LOG.info("Making checkers")
+        with utils.timed(self.phase_times, "file discovery"):
+            self.filenames = self.find_filenames()
+        self.results = []
+        self.results_found = self.results_reported = 0
+        if self.streaming:
+            self._stream_order = collections.deque(sorted(self.filenames))
+            self._stream_reported = set()
+        # with --watch the cache is kept from the previous check
+        if self.cache is None and self.options.watch:
+            self.cache = cache.StatCache()
+        elif self.cache is None and self.options.cache_dir is not None:
+            self.cache = cache.ResultCache(
+                self.options.cache_dir,
+                self.plugins,
+                self.options,
+                max_size=defaults.CACHE_MAX_SIZE,
+            )
+        if self.cache is not None:
+            with utils.timed(self.phase_times, "cache lookup"):
+                self.cached_results, self.filenames = self.cache.partition(
+                    self.filenames,
+                )
         self.jobs = min(len(self.filenames), self.jobs)
 
     def stop(self) -> None:
         """Stop checking files."""
         self._process_statistics()
+        if self.cache is not None:
+            self.cache.prune()
 
 
 class FileChecker:
@@ -276,11 +680,18 @@ class FileChecker:
         self.filename = filename
         self.plugins = plugins
         self.results: Results = []
+        #: (plugin display name, check type) => [seconds, calls] with
+        #: ``--profile-plugins``
+        self.timings: _Timings | None = None
+        # check type => [(plugin, call)], see :meth:`_calls`
+        self._compiled_calls: dict[str, list[tuple[LoadedPlugin, _Call]]] = {}
         self.statistics = {
             "tokens": 0,
             "logical lines": 0,
             "physical lines": 0,
         }
+        #: whether any plugin checks the logical or physical lines
+        self.needs_tokens = bool(plugins.logical_line or plugins.physical_line)
         self.processor = self._make_processor()
         self.display_name = filename
         self.should_process = False
@@ -338,8 +749,53 @@ class FileChecker:
             raise exceptions.PluginRequestedUnknownParameters(
                 plugin_name=plugin.display_name, exception=ae,
             )
+        return self._run_call(plugin, plugin.obj, **arguments, **params)
+
+    def _calls(self, check_type: str) -> list[tuple[LoadedPlugin, _Call]]:
+        """Return the compiled calls of the plugins of a type of check."""
+        calls = self._compiled_calls.get(check_type)
+        if calls is None:
+            calls = self._compiled_calls[check_type] = [
+                (plugin, self._compile_call(plugin, check_type))
+                for plugin in getattr(self.plugins, check_type)
+            ]
+        return calls
+
+    def _compile_call(self, plugin: LoadedPlugin, argument: str) -> _Call:
+        """Compile how the plugin is called with the processor's state.
+
+        The parameters are read with :func:`operator.attrgetter` and passed
+        positionally instead of going through
+        :meth:`~flake8.processor.FileProcessor.keyword_arguments_for` for
+        every call.
+        """
+        processor = self.processor
+        assert processor is not None, self.filename
+        names = list(plugin.parameters)
+        if not all(
+            name == argument or _has_attribute(processor, name)
+            for name in names
+        ):
+            # let run_check warn about (or reject) the unknown parameters
+            return lambda value: self.run_check(plugin, **{argument: value})
+
+        i = names.index(argument)
+        before = _attrs_getter(names[:i])
+        after = _attrs_getter(names[i + 1:])
+        run_call, obj = self._run_call, plugin.obj
+        return lambda value: run_call(
+            plugin, obj, *before(processor), value, *after(processor),
+        )
+
+    def _run_call(
+        self,
+        plugin: LoadedPlugin,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
         try:
-            return plugin.obj(**arguments, **params)
+            return func(*args, **kwargs)
         except Exception as all_exc:
             LOG.critical(
                 "Plugin %s raised an unexpected exception",
@@ -352,6 +808,15 @@ class FileChecker:
                 exception=all_exc,
             )
 
+    def _record_time(
+        self, plugin: LoadedPlugin, check_type: str, start: float,
+    ) -> None:
+        assert self.timings is not None
+        key = (plugin.display_name, check_type)
+        timing = self.timings.setdefault(key, [0.0, 0])
+        timing[0] += time.perf_counter() - start
+        timing[1] += 1
+
     @staticmethod
     def _extract_syntax_information(exception: Exception) -> tuple[int, int]:
         if (
@@ -379,8 +844,11 @@ class FileChecker:
         assert self.processor is not None, self.filename
         ast = self.processor.build_ast()
 
-        for plugin in self.plugins.tree:
-            checker = self.run_check(plugin, tree=ast)
+        profile = self.timings is not None
+        for plugin, call in self._calls("tree"):
+            if profile:
+                start = time.perf_counter()
+            checker = call(ast)
             # If the plugin uses a class, call the run method of it, otherwise
             # the call should return something iterable itself
             try:
@@ -394,6 +862,8 @@ class FileChecker:
                     column=offset,
                     text=text,
                 )
+            if profile:
+                self._record_time(plugin, "tree", start)
 
     def run_logical_checks(self) -> None:
         """Run all checks expecting a logical line."""
@@ -405,11 +875,19 @@ class FileChecker:
 
         LOG.debug('Logical line: "%s"', logical_line.rstrip())
 
-        for plugin in self.plugins.logical_line:
+        profile = self.timings is not None
+        offsets = None
+        for plugin, call in self._calls("logical_line"):
+            if profile:
+                start = time.perf_counter()
             self.processor.update_checker_state_for(plugin)
-            results = self.run_check(plugin, logical_line=logical_line) or ()
+            results = call(logical_line) or ()
             for offset, text in results:
-                line_number, column_offset = find_offset(offset, mapping)
+                if offsets is None:
+                    offsets = [token[0] for token in mapping]
+                line_number, column_offset = find_offset(
+                    offset, mapping, offsets,
+                )
                 if line_number == column_offset == 0:
                     LOG.warning("position of error out of bounds: %s", plugin)
                 self.report(
@@ -418,6 +896,8 @@ class FileChecker:
                     column=column_offset,
                     text=text,
                 )
+            if profile:
+                self._record_time(plugin, "logical_line", start)
 
         self.processor.next_logical_line()
 
@@ -427,9 +907,12 @@ class FileChecker:
         A single physical check may return multiple errors.
         """
         assert self.processor is not None
-        for plugin in self.plugins.physical_line:
+        profile = self.timings is not None
+        for plugin, call in self._calls("physical_line"):
+            if profile:
+                start = time.perf_counter()
             self.processor.update_checker_state_for(plugin)
-            result = self.run_check(plugin, physical_line=physical_line)
+            result = call(physical_line)
 
             if result is not None:
                 # This is a single result if first element is an int
@@ -451,6 +934,8 @@ class FileChecker:
                         column=column_offset,
                         text=text,
                     )
+            if profile:
+                self._record_time(plugin, "physical_line", start)
 
     def process_tokens(self) -> None:
         """Process tokens and trigger checks.
@@ -484,9 +969,13 @@ class FileChecker:
         if self.processor is None or not self.should_process:
             return self.display_name, self.results, self.statistics
 
+        if self.options.profile_plugins:
+            self.timings = {}
+
         try:
             self.run_ast_checks()
-            self.process_tokens()
+            if self.needs_tokens:
+                self.process_tokens()
         except (SyntaxError, tokenize.TokenError) as e:
             code = "E902" if isinstance(e, tokenize.TokenError) else "E999"
             row, column = self._extract_syntax_information(e)
@@ -547,10 +1036,28 @@ class FileChecker:
 def _try_initialize_processpool(
     job_count: int,
     argv: Sequence[str],
+    maxtasksperchild: int | None = None,
+    plan: RunPlan | None = None,
 ) -> multiprocessing.pool.Pool | None:
-    """Return a new process pool instance if we are able to create one."""
+    """Return a new process pool instance if we are able to create one.
+
+    The workers are given the ``plan`` if there is one, otherwise they
+    parse ``argv`` again (unless they are forked).
+    """
     try:
-        return multiprocessing.Pool(job_count, _mp_init, initargs=(argv,))
+        if plan is not None:
+            return multiprocessing.Pool(
+                job_count,
+                _mp_init_plan,
+                initargs=(plan,),
+                maxtasksperchild=maxtasksperchild,
+            )
+        return multiprocessing.Pool(
+            job_count,
+            _mp_init,
+            initargs=(argv,),
+            maxtasksperchild=maxtasksperchild,
+        )
     except OSError as err:
         if err.errno not in SERIAL_RETRY_ERRNOS:
             raise
@@ -560,19 +1067,63 @@ def _try_initialize_processpool(
     return None
 
 
+def _schedule(
+    filenames: Sequence[str], job_count: int,
+) -> list[tuple[str, ...]]:
+    """Group the files into chunks of work for the process pool.
+
+    The files are ordered largest first so that a single large file is not
+    left to be checked while the other workers sit idle.  Each chunk is a
+    fraction of the remaining work (estimated from the file sizes) which
+    shrinks as the run progresses: early chunks are large to reduce the
+    overhead of sending work to the workers and the last chunks are small to
+    balance the end of the run.
+    """
+    costs = {}
+    for filename in filenames:
+        try:
+            size = os.path.getsize(filename)
+        except OSError:
+            # the file checker will report this as E902
+            size = 0
+        costs[filename] = size + _FILE_COST
+
+    remaining = sum(costs.values())
+    chunks = []
+    chunk: list[str] = []
+    chunk_cost = 0
+    for filename in sorted(filenames, key=costs.__getitem__, reverse=True):
+        chunk.append(filename)
+        chunk_cost += costs[filename]
+        if chunk_cost >= max(remaining // (job_count * 2), _MIN_CHUNK_COST):
+            chunks.append(tuple(chunk))
+            remaining -= chunk_cost
+            chunk = []
+            chunk_cost = 0
+    if chunk:
+        chunks.append(tuple(chunk))
+    return chunks
+
+
 def find_offset(
-    offset: int, mapping: processor._LogicalMapping,
+    offset: int | tuple[int, int],
+    mapping: processor._LogicalMapping,
+    offsets: Sequence[int] | None = None,
 ) -> tuple[int, int]:
-    """Find the offset tuple for a single offset."""
+    """Find the offset tuple for a single offset.
+
+    :param offsets:
+        The offsets of the ``mapping`` (``[token[0] for token in mapping]``),
+        to look up the many offsets reported in a logical line without
+        scanning it each time.
+    """
     if isinstance(offset, tuple):
         return offset
 
-    for token in mapping:
-        token_offset = token[0]
-        if offset <= token_offset:
-            position = token[1]
-            break
-    else:
-        position = (0, 0)
-        offset = token_offset = 0
+    if offsets is None:
+        offsets = [token[0] for token in mapping]
+    i = bisect.bisect_left(offsets, offset)
+    if i == len(mapping):
+        return (0, 0)
+    token_offset, position = mapping[i]
     return (position[0], position[1] + offset - token_offset)
@@ -19,11 +19,32 @@ IGNORE = ("E121", "E123", "E126", "E226", "E24", "E704", "W503", "W504")
 MAX_LINE_LENGTH = 79
 INDENT_SIZE = 4
 
+# Upper bound on the size of the --cache-dir, in bytes
+CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# Seconds between looking for changed files with --watch, at least
+WATCH_INTERVAL = 0.5
+# The fraction of the time --watch spends looking for changed files, at most
+WATCH_MAX_LOAD = 0.1
+
 # Other constants
 WHITESPACE = frozenset(" \t")
 
 STATISTIC_NAMES = ("logical lines", "physical lines", "tokens")
 
+# the phases of a run timed by --benchmark, in order
+PHASE_NAMES = (
+    "config discovery",
+    "plugin discovery",
+    "plugin import",
+    "option aggregation",
+    "file discovery",
+    "cache lookup",
+    "pool startup",
+    "checking",
+    "reporting",
+)
+
 NOQA_INLINE_REGEXP = re.compile(
     # We're looking for items that look like this:
     # ``# noqa``
@@ -1,21 +1,32 @@
 """Functions related to discovering paths."""
 from __future__ import annotations
 
+import functools
 import logging
 import os.path
+import subprocess
+import time
 from collections.abc import Callable
 from collections.abc import Generator
+from collections.abc import Iterable
 from collections.abc import Sequence
+from typing import NamedTuple
 
 from flake8 import utils
+from flake8.exceptions import ExecutionError
 
 LOG = logging.getLogger(__name__)
 
+# the modification times of directories are at least this precise (the
+# coarsest of the common file systems, FAT, has a resolution of 2 seconds)
+_MTIME_RESOLUTION_NS = 2_000_000_000
+
 
 def _filenames_from(
     arg: str,
     *,
     predicate: Callable[[str], bool],
+    listings: DirectoryListings | None = None,
 ) -> Generator[str]:
     """Generate filenames from an argument.
 
@@ -26,6 +37,9 @@ def _filenames_from(
         returns ``True`` we will exclude the filename, otherwise we
         will yield it. By default, we include every filename
         generated.
+    :param listings:
+        If given, the listings of the directories which are unchanged
+        since the last walk are reused.
     :returns:
         Generator of paths
     """
@@ -33,33 +47,255 @@ def _filenames_from(
         return
 
     if os.path.isdir(arg):
-        for root, sub_directories, files in os.walk(arg):
-            # NOTE(sigmavirus24): os.walk() will skip a directory if you
-            # remove it from the list of sub-directories.
-            for directory in tuple(sub_directories):
-                joined = os.path.join(root, directory)
-                if predicate(joined):
-                    sub_directories.remove(directory)
-
-            for filename in files:
-                joined = os.path.join(root, filename)
-                if not predicate(joined):
-                    yield joined
+        yield from _walk(arg, predicate, listings)
     else:
         yield arg
 
 
+class _Listing(NamedTuple):
+    files: tuple[str, ...]
+    sub_directories: tuple[str, ...]
+
+
+def _scan(root: str, predicate: Callable[[str], bool]) -> _Listing | None:
+    """List the files and the directories to descend into in a directory.
+
+    The type information of the directory entries is reused so most files
+    and directories don't need another ``stat``.  Excluded files and
+    directories are left out.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return None
+
+    files = []
+    sub_directories = []
+    for entry in entries:
+        joined = os.path.join(root, entry.name)
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if is_dir:
+            # like os.walk(), symlinks to directories are not descended into
+            # nor are they reported as files
+            if not predicate(joined) and not entry.is_symlink():
+                sub_directories.append(joined)
+        elif not predicate(joined):
+            files.append(joined)
+    return _Listing(tuple(files), tuple(sub_directories))
+
+
+class DirectoryListings:
+    """Remember the listing of each walked directory while it is unchanged.
+
+    This is used by ``--watch`` so that looking for added and removed files
+    only lists the directories whose modification time changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the listings."""
+        # directory => (modification time, whether it can be trusted,
+        # listing) for the directories of the last walk
+        self._listings: dict[str, tuple[int, bool, _Listing]] = {}
+        self._seen: dict[str, tuple[int, bool, _Listing]] = {}
+
+    def listing(
+        self, root: str, predicate: Callable[[str], bool],
+    ) -> _Listing | None:
+        """List a directory, unless it is unchanged since it was listed."""
+        try:
+            mtime_ns = os.stat(root).st_mtime_ns
+        except OSError:
+            return None
+
+        known = self._listings.get(root)
+        if known is not None and known[:2] == (mtime_ns, True):
+            self._seen[root] = known
+            return known[2]
+
+        now_ns = time.time_ns()
+        listing = _scan(root, predicate)
+        if listing is None:
+            return None
+        # a change in the same tick of the file system clock as this
+        # listing would not change the modification time so the listing
+        # is only trusted once that tick has passed
+        trusted = mtime_ns < now_ns - _MTIME_RESOLUTION_NS
+        self._seen[root] = (mtime_ns, trusted, listing)
+        return listing
+
+    def prune(self) -> None:
+        """Forget the directories which were not seen by the last walk."""
+        self._listings, self._seen = self._seen, {}
+
+
+def _walk(
+    root: str,
+    predicate: Callable[[str], bool],
+    listings: DirectoryListings | None = None,
+) -> Generator[str]:
+    """Walk a directory like :func:`os.walk` (without following symlinks).
+
+    Excluded directories are not descended into.  With ``listings`` the
+    directories which did not change since they were last walked are not
+    listed again.
+    """
+    if listings is None:
+        listing = _scan(root, predicate)
+    else:
+        listing = listings.listing(root, predicate)
+    if listing is None:
+        return
+
+    yield from listing.files
+    for directory in listing.sub_directories:
+        yield from _walk(directory, predicate, listings)
+
+
+def _git(*args: str, cwd: str | None = None) -> list[str]:
+    cmd = ("git", *args)
+    try:
+        out = subprocess.run(
+            cmd, cwd=cwd, capture_output=True, check=True,
+        ).stdout
+    except FileNotFoundError:
+        raise ExecutionError("`git` is not installed")
+    except subprocess.CalledProcessError as e:
+        msg = e.stderr.decode(errors="replace").strip()
+        raise ExecutionError(f"`{' '.join(cmd)}` failed: {msg}")
+    return [os.fsdecode(name) for name in out.split(b"\0") if name]
+
+
+def _git_toplevel() -> str:
+    return _git("rev-parse", "--show-toplevel")[0].rstrip("\n")
+
+
+def _git_changed_files(rev: str, toplevel: str) -> set[str]:
+    """Find the files changed since ``rev`` as absolute paths.
+
+    This includes files which are modified or added compared to ``rev``
+    (whether they are staged or not) and untracked files which are not
+    ignored.  Deleted files are not included.
+    """
+    changed = _git(
+        "diff", "--name-only", "--diff-filter=d", "-z", rev, "--",
+        cwd=toplevel,
+    )
+    untracked = _git(
+        "ls-files", "--others", "--exclude-standard", "-z",
+        cwd=toplevel,
+    )
+    return {
+        os.path.join(toplevel, name) for name in (*changed, *untracked)
+    }
+
+
+def _git_files(toplevel: str) -> set[str]:
+    """Find the files git does not ignore as absolute paths.
+
+    These are the files in the index and the untracked files which are not
+    ignored.  Files which were deleted are not included.
+    """
+    files = _git(
+        "ls-files", "--cached", "--others", "--exclude-standard", "-z",
+        cwd=toplevel,
+    )
+    deleted = _git("ls-files", "--deleted", "-z", cwd=toplevel)
+    return {
+        os.path.join(toplevel, name)
+        for name in set(files).difference(deleted)
+    }
+
+
+def _listed_filenames_from(
+    arg: str,
+    *,
+    listed: set[str],
+    toplevel: str,
+    predicate: Callable[[str], bool],
+) -> Generator[str]:
+    """Generate the filenames from an argument which are in ``listed``.
+
+    This behaves like :func:`_filenames_from` (including excluding the
+    files in excluded directories) without walking the directories.
+    """
+    if predicate(arg):
+        return
+    elif arg == "-":
+        yield arg
+        return
+
+    real = os.path.realpath(arg)
+    if os.path.commonpath((real, toplevel)) != toplevel and real not in listed:
+        LOG.warning(
+            "%s is outside of the git repository %s, not checking it",
+            arg,
+            toplevel,
+        )
+        return
+
+    if os.path.isdir(arg):
+        yield from _listed_in_directory(arg, real, listed, predicate)
+    elif real in listed:
+        yield arg
+
+
+def _listed_in_directory(
+    arg: str,
+    real: str,
+    listed: set[str],
+    predicate: Callable[[str], bool],
+) -> Generator[str]:
+    prefix = os.path.join(real, "")
+    # whether each directory (joined to ``arg``) is excluded
+    excluded = {arg: False}
+    for filename in sorted(f for f in listed if f.startswith(prefix)):
+        directory, basename = os.path.split(filename[len(prefix):])
+        joined = arg
+        for part in directory.split(os.sep) if directory else ():
+            parent, joined = joined, os.path.join(joined, part)
+            if joined not in excluded:
+                excluded[joined] = excluded[parent] or predicate(joined)
+        if excluded[joined]:
+            continue
+        joined = os.path.join(joined, basename)
+        if not predicate(joined):
+            yield joined
+
+
 def expand_paths(
     *,
     paths: Sequence[str],
     stdin_display_name: str,
     filename_patterns: Sequence[str],
     exclude: Sequence[str],
+    changed_since: str | None = None,
+    respect_gitignore: bool = False,
+    listings: DirectoryListings | None = None,
 ) -> Generator[str]:
-    """Expand out ``paths`` from commandline to the lintable files."""
+    """Expand out ``paths`` from commandline to the lintable files.
+
+    :param changed_since:
+        If given, only the files which git reports as changed since this
+        revision are included.
+    :param respect_gitignore:
+        If true, the files in directories are listed by git instead of
+        walking the directories so the files git ignores are not included.
+    :param listings:
+        If given, the directories which are unchanged since they were last
+        walked with these listings are not listed again.  Call
+        :meth:`DirectoryListings.prune` once the files are expanded.
+    """
     if not paths:
         paths = ["."]
 
+    exclude_matcher = utils.FilenameMatcher(exclude)
+    filename_matcher = utils.FilenameMatcher(filename_patterns)
+
     def is_excluded(arg: str) -> bool:
         if arg == "-":
             # if the stdin_display_name is the default, always include it
@@ -67,23 +303,48 @@ def expand_paths(
                 return False
             arg = stdin_display_name
 
-        return utils.matches_filename(
-            arg,
-            patterns=exclude,
-            log_message='"%(path)s" has %(whether)sbeen excluded',
-            logger=LOG,
+        excluded = exclude_matcher.first_match(arg) is not None
+        if excluded:
+            LOG.debug('"%s" has been excluded', arg)
+        return excluded
+
+    filenames_from: Callable[[str], Iterable[str]]
+    if changed_since is not None:
+        toplevel = os.path.realpath(_git_toplevel())
+        # the changed files already do not include ignored files
+        filenames_from = functools.partial(
+            _listed_filenames_from,
+            listed=_git_changed_files(changed_since, toplevel),
+            toplevel=toplevel,
+            predicate=is_excluded,
+        )
+    elif respect_gitignore:
+        toplevel = os.path.realpath(_git_toplevel())
+        listed = _git_files(toplevel)
+        # files given explicitly are checked even if git ignores them
+        listed.update(os.path.realpath(p) for p in paths if p != "-")
+        filenames_from = functools.partial(
+            _listed_filenames_from,
+            listed=listed,
+            toplevel=toplevel,
+            predicate=is_excluded,
+        )
+    else:
+        filenames_from = functools.partial(
+            _filenames_from, predicate=is_excluded, listings=listings,
         )
 
     return (
         filename
         for path in paths
-        for filename in _filenames_from(path, predicate=is_excluded)
+        for filename in filenames_from(path)
         if (
             # always lint `-`
             filename == "-"
             # always lint explicitly passed (even if not matching filter)
             or path == filename
             # otherwise, check the file against filtered patterns
-            or utils.fnmatch(filename, filename_patterns)
+            or not filename_patterns
+            or filename_matcher.first_match_name(filename) is not None
         )
     )
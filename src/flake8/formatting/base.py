@@ -7,6 +7,8 @@ import sys
 from typing import IO
 
 from flake8.formatting import _windows_color
+from flake8.statistics import FileTiming
+from flake8.statistics import PluginTiming
 from flake8.statistics import Statistics
 from flake8.violation import Violation
 
@@ -143,6 +145,38 @@ class BaseFormatter:
                 benchmark = float_format(statistic=statistic, value=value)
             self._write(benchmark)
 
+    def show_plugin_timings(self, timings: list[PluginTiming]) -> None:
+        """Format and print the time spent running each plugin."""
+        width = max((len(timing.plugin) for timing in timings), default=0)
+        self._write(
+            f"{'plugin':<{width}} {'check':<13} {'seconds':>10} "
+            f"{'calls':>10} {'per file':>10}",
+        )
+        for timing in timings:
+            self._write(
+                f"{timing.plugin:<{width}} {timing.check_type:<13} "
+                f"{timing.seconds:>10.3f} {timing.calls:>10} "
+                f"{timing.seconds / timing.files:>10.5f}",
+            )
+
+    def show_slowest_files(self, timings: list[FileTiming]) -> None:
+        """Format and print the files which took the longest to check."""
+        width = max((len(timing.filename) for timing in timings), default=0)
+        self._write(
+            f"{'file':<{width}} {'seconds':>10} {'physical':>10} "
+            f"{'logical':>10} {'tokens':>10}",
+        )
+        for timing in timings:
+            logical_lines, tokens = (
+                "n/a" if count is None else count
+                for count in (timing.logical_lines, timing.tokens)
+            )
+            self._write(
+                f"{timing.filename:<{width}} {timing.seconds:>10.3f} "
+                f"{timing.physical_lines:>10} {logical_lines:>10} "
+                f"{tokens:>10}",
+            )
+
     def show_source(self, error: Violation) -> str | None:
         """Show the physical line generating the error.
 
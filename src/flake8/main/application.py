@@ -2,21 +2,27 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import logging
+import operator
 import time
 from collections.abc import Sequence
 
 import flake8
+from flake8 import cache
 from flake8 import checker
 from flake8 import defaults
 from flake8 import exceptions
 from flake8 import style_guide
+from flake8 import utils
 from flake8.formatting.base import BaseFormatter
 from flake8.main import debug
 from flake8.options.parse_args import parse_args
 from flake8.plugins import finder
 from flake8.plugins import reporter
+from flake8.statistics import FileTiming
+from flake8.statistics import PluginTiming
 
 
 LOG = logging.getLogger(__name__)
@@ -54,6 +60,8 @@ class Application:
         #: Whether or not something catastrophic happened and we should exit
         #: with a non-zero status code
         self.catastrophic_failure = False
+        #: The seconds spent in each phase of the run for ``--benchmark``
+        self.phase_times: dict[str, float] = {}
 
     def exit_code(self) -> int:
         """Return the program exit code."""
@@ -100,7 +108,8 @@ class Application:
 
         self.file_checker_manager.start()
         try:
-            self.file_checker_manager.run()
+            with utils.timed(self.phase_times, "checking"):
+                self.file_checker_manager.run()
         except exceptions.PluginExecutionFailed as plugin_failed:
             print(str(plugin_failed))
             print("Run flake8 with greater verbosity to see more details")
@@ -112,7 +121,7 @@ class Application:
     def report_benchmarks(self) -> None:
         """Aggregate, calculate, and report benchmarks for this run."""
         assert self.options is not None
-        if not self.options.benchmark:
+        if not (self.options.benchmark or self.options.benchmark_json):
             return
 
         assert self.file_checker_manager is not None
@@ -120,15 +129,105 @@ class Application:
         time_elapsed = self.end_time - self.start_time
         statistics = [("seconds elapsed", time_elapsed)]
         add_statistic = statistics.append
-        for statistic in defaults.STATISTIC_NAMES + ("files",):
+        counted: tuple[str, ...] = defaults.STATISTIC_NAMES + ("files",)
+        if not self.file_checker_manager.needs_tokens:
+            # without checks of the lines the files are never tokenized
+            counted = ("physical lines", "files")
+        for statistic in counted:
             value = self.file_checker_manager.statistics[statistic]
             total_description = f"total {statistic} processed"
             add_statistic((total_description, value))
             per_second_description = f"{statistic} processed per second"
             add_statistic((per_second_description, int(value / time_elapsed)))
 
+        result_cache = self.file_checker_manager.cache
+        if result_cache is not None:
+            add_statistic(("cache hits", result_cache.hits))
+            add_statistic(("cache misses", result_cache.misses))
+
+        if self.options.worker_max_files or self.options.worker_max_memory:
+            recycled = self.file_checker_manager.workers_recycled
+            add_statistic(("workers recycled", recycled))
+
+        phases = self._phases()
+        if self.options.benchmark:
+            assert self.formatter is not None
+            self.formatter.show_benchmarks(
+                [
+                    *statistics,
+                    *((f"seconds {name}", sec) for name, sec in phases),
+                ],
+            )
+
+        if self.options.benchmark_json:
+            with open(self.options.benchmark_json, "w") as f:
+                json.dump(
+                    {"statistics": dict(statistics), "phases": dict(phases)},
+                    f,
+                    indent=2,
+                )
+                f.write("\n")
+
+    def _phases(self) -> list[tuple[str, float]]:
+        assert self.file_checker_manager is not None
+        manager_times = self.file_checker_manager.phase_times
+        phase_times = dict(self.phase_times)
+        for phase, seconds in manager_times.items():
+            phase_times[phase] = phase_times.get(phase, 0.0) + seconds
+        # the pools are started and the results streamed while checking
+        if "checking" in phase_times:
+            phase_times["checking"] -= manager_times.get("pool startup", 0.0)
+            phase_times["checking"] -= manager_times.get("reporting", 0.0)
+        return [
+            (phase, phase_times[phase])
+            for phase in defaults.PHASE_NAMES
+            if phase in phase_times
+        ]
+
+    def report_plugin_timings(self) -> None:
+        """Report the time spent running each plugin, slowest first."""
+        assert self.options is not None
+        if not self.options.profile_plugins:
+            return
+
+        assert self.file_checker_manager is not None
+        timings = [
+            PluginTiming(plugin, check_type, seconds, int(calls), int(files))
+            for (plugin, check_type), (seconds, calls, files) in (
+                self.file_checker_manager.plugin_timings.items()
+            )
+        ]
+        timings.sort(key=lambda timing: timing.seconds, reverse=True)
+
         assert self.formatter is not None
-        self.formatter.show_benchmarks(statistics)
+        self.formatter.show_plugin_timings(timings)
+
+    def report_slowest_files(self) -> None:
+        """Report the files which took the longest to check."""
+        assert self.options is not None
+        if not self.options.slowest:
+            return
+
+        assert self.file_checker_manager is not None
+        slowest = heapq.nlargest(
+            self.options.slowest,
+            self.file_checker_manager.file_times,
+            key=operator.itemgetter(0),
+        )
+        tokenized = self.file_checker_manager.needs_tokens
+        timings = [
+            FileTiming(
+                filename,
+                seconds,
+                statistics["physical lines"],
+                statistics["logical lines"] if tokenized else None,
+                statistics["tokens"] if tokenized else None,
+            )
+            for seconds, filename, statistics in slowest
+        ]
+
+        assert self.formatter is not None
+        self.formatter.show_slowest_files(timings)
 
     def report_errors(self) -> None:
         """Report all the errors found by flake8 3.0.
@@ -162,7 +261,7 @@ class Application:
         This finds the plugins, registers their options, and parses the
         command-line arguments.
         """
-        self.plugins, self.options = parse_args(argv)
+        self.plugins, self.options = parse_args(argv, self.phase_times)
 
         if self.options.bug_report:
             info = debug.information(flake8.__version__, self.plugins)
@@ -176,17 +275,77 @@ class Application:
     def report(self) -> None:
         """Report errors, statistics, and benchmarks."""
         assert self.formatter is not None
-        self.formatter.start()
-        self.report_errors()
-        self.report_statistics()
+        assert self.file_checker_manager is not None
+        if not self.file_checker_manager.streaming:
+            self.formatter.start()
+        with utils.timed(self.phase_times, "reporting"):
+            self.report_errors()
+            self.report_statistics()
         self.report_benchmarks()
+        self.report_plugin_timings()
+        self.report_slowest_files()
         self.formatter.stop()
 
-    def _run(self, argv: Sequence[str]) -> None:
-        self.initialize(argv)
+    def watch(self, argv: Sequence[str]) -> None:
+        """Check the files again each time they change.
+
+        Only the files which changed are checked again, the results of the
+        other files are kept from the previous check.  This runs until it is
+        interrupted.
+        """
+        assert self.options is not None
+        assert self.file_checker_manager is not None
+        if utils.is_using_stdin(self.options.filenames):
+            LOG.warning("The --watch option is not compatible with - .")
+            return
+
+        result_cache = self.file_checker_manager.cache
+        assert isinstance(result_cache, cache.StatCache)
+        listings = self.file_checker_manager.listings
+        interval = defaults.WATCH_INTERVAL
+        while True:
+            time.sleep(interval)
+            # only the directories which changed are listed again and only
+            # the files found are compared
+            start = time.perf_counter()
+            filenames = self.file_checker_manager.find_filenames()
+            changed = result_cache.changed(filenames)
+            elapsed = time.perf_counter() - start
+            # in a large tree, looking for changes should not keep a core busy
+            interval = max(
+                defaults.WATCH_INTERVAL, elapsed / defaults.WATCH_MAX_LOAD,
+            )
+            if not changed:
+                continue
+
+            self.start_time = time.time()
+            self.phase_times = {}
+            result_cache.hits = result_cache.misses = 0
+            self.make_guide()
+            self.make_file_checker_manager(argv)
+            self.file_checker_manager.cache = result_cache
+            self.file_checker_manager.listings = listings
+            self._check()
+
+    def _check(self) -> None:
+        assert self.file_checker_manager is not None
+        if self.file_checker_manager.streaming:
+            # results are reported while the checks are running
+            assert self.formatter is not None
+            self.formatter.start()
         self.run_checks()
         self.report()
 
+    def _run(self, argv: Sequence[str]) -> None:
+        self.initialize(argv)
+        self._check()
+        assert self.options is not None
+        if self.options.watch:
+            try:
+                self.watch(argv)
+            except KeyboardInterrupt:
+                pass  # the usual way to stop watching
+
     def run(self, argv: Sequence[str]) -> None:
         """Run our application.
 
@@ -4,8 +4,6 @@ from __future__ import annotations
 import sys
 from collections.abc import Sequence
 
-from flake8.main import application
-
 
 def main(argv: Sequence[str] | None = None) -> int:
     """Execute the main bit of the application.
@@ -19,6 +17,16 @@ def main(argv: Sequence[str] | None = None) -> int:
     if argv is None:
         argv = sys.argv[1:]
 
+    # checked before parsing anything so that the client stays cheap to start
+    if "--daemon" in argv:
+        from flake8.main import daemon
+
+        exit_code = daemon.run_client(argv)
+        if exit_code is not None:
+            return exit_code
+
+    from flake8.main import application
+
     app = application.Application()
     app.run(argv)
     return app.exit_code()
@@ -0,0 +1,291 @@
+"""A resident flake8 process serving invocations over a Unix socket.
+
+The daemon discovers and imports the installed plugins once and then forks a
+child for every request.  The child adopts the client's standard streams,
+working directory and environment and runs the normal
+:class:`~flake8.main.application.Application` so configuration is always
+read fresh while the expensive startup work is inherited from the parent.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections.abc import Sequence
+
+import flake8
+
+# exit after this many seconds without a request
+IDLE_TIMEOUT = 30 * 60
+# how long a client waits for a freshly spawned daemon to start listening
+STARTUP_TIMEOUT = 10.0
+
+_MAX_MESSAGE = 1024 * 1024
+
+
+def supported() -> bool:
+    """Whether this platform can run the daemon."""
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "fork")
+
+
+def socket_path() -> str:
+    """Return the socket path for this user and python environment.
+
+    Each interpreter / virtualenv gets its own daemon so that the plugins it
+    serves are the ones the client would have loaded.
+    """
+    env = f"{sys.executable}\0{sys.prefix}\0{flake8.__version__}"
+    digest = hashlib.sha256(env.encode()).hexdigest()[:16]
+    dirname = os.path.join(tempfile.gettempdir(), f"flake8-{os.getuid()}")
+    return os.path.join(dirname, f"{digest}.sock")
+
+
+def _environment_stamp() -> tuple[tuple[str, int], ...]:
+    # installing or removing a distribution changes the mtime of the
+    # directory on ``sys.path`` it is installed into
+    ret = []
+    for path in sys.path:
+        try:
+            ret.append((path, os.stat(path or ".").st_mtime_ns))
+        except OSError:
+            continue
+    return tuple(ret)
+
+
+def _recv_message(conn: socket.socket) -> bytes:
+    buf = b""
+    while not buf.endswith(b"\n"):
+        chunk = conn.recv(4096)
+        if not chunk or len(buf) > _MAX_MESSAGE:
+            raise ConnectionError("connection closed before end of message")
+        buf += chunk
+    return buf
+
+
+def _send_json(conn: socket.socket, obj: object) -> None:
+    conn.sendall(json.dumps(obj).encode() + b"\n")
+
+
+def _cancel_when_disconnected(conn: socket.socket) -> None:
+    # the client never sends anything after the request: end of file means
+    # it went away (for instance ^C) and we should stop as well -- without
+    # interrupting the run with a traceback for a client which is not there
+    with contextlib.suppress(OSError):
+        conn.recv(1)
+    os._exit(1)
+
+
+def _handle(conn: socket.socket) -> None:
+    from flake8.main import application
+
+    msg, fds, _, _ = socket.recv_fds(conn, 4096, 3)
+    if not msg.endswith(b"\n"):
+        msg += _recv_message(conn)
+    request = json.loads(msg)
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+
+    threading.Thread(
+        target=_cancel_when_disconnected, args=(conn,), daemon=True,
+    ).start()
+
+    try:
+        app = application.Application()
+        app.run(request["argv"])
+        exit_code = app.exit_code()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            exit_code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except Exception:
+        traceback.print_exc()
+        exit_code = 1
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    _send_json(conn, {"exit_code": exit_code})
+
+
+def _serve_one(conn: socket.socket, stale: bool) -> None:
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if stale:
+        # distributions changed since we started -- don't trust our cache
+        from flake8.plugins import finder
+
+        finder._prefound = None
+
+    exit_code = 1
+    try:
+        _handle(conn)
+        exit_code = 0
+    finally:
+        os._exit(exit_code)
+
+
+def _reap() -> None:
+    with contextlib.suppress(ChildProcessError):
+        while os.waitpid(-1, os.WNOHANG)[0] != 0:
+            pass
+
+
+def _ensure_private_dir(path: str) -> None:
+    # the socket is handed our standard streams: make sure nobody else can
+    # have put it there
+    dirname = os.path.dirname(path)
+    os.makedirs(dirname, mode=0o700, exist_ok=True)
+    st = os.lstat(dirname)
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{dirname} is not private to this user")
+
+
+def _listen(path: str) -> socket.socket:
+    _ensure_private_dir(path)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+    sock = socket.socket(socket.AF_UNIX)
+    sock.bind(path)
+    sock.listen()
+    return sock
+
+
+def serve(path: str, idle_timeout: float = IDLE_TIMEOUT) -> int:
+    """Serve flake8 invocations on the Unix socket at ``path``.
+
+    This returns after ``idle_timeout`` seconds without a request.  When the
+    installed distributions change the daemon restarts itself.
+    """
+    # the client shares this module: only the daemon pays for these imports
+    from flake8.main import application  # noqa: F401
+    from flake8.plugins import finder
+
+    with finder._prefind() as plugins:
+        # warm up the imports, errors are reported by the invocations
+        for plugin in plugins:
+            with contextlib.suppress(Exception):
+                plugin.entry_point.load()
+
+        stamp = _environment_stamp()
+        sock = _listen(path)
+        sock.settimeout(idle_timeout)
+        with sock:
+            while True:
+                try:
+                    conn, _ = sock.accept()
+                except TimeoutError:
+                    break
+                _reap()
+
+                stale = _environment_stamp() != stamp
+                with conn:
+                    if os.fork() == 0:  # pragma: no cover (child)
+                        sock.close()
+                        _serve_one(conn, stale)
+
+                if stale:
+                    sock.close()
+                    os.execv(sys.executable, _serve_cmd(path))
+
+    with contextlib.suppress(OSError):
+        os.remove(path)
+    return 0
+
+
+def _serve_cmd(path: str) -> list[str]:
+    return [sys.executable, "-m", "flake8.main.daemon", path]
+
+
+def _connect(path: str) -> socket.socket | None:
+    sock = socket.socket(socket.AF_UNIX)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    else:
+        return sock
+
+
+def _start(path: str) -> socket.socket | None:
+    subprocess.Popen(
+        _serve_cmd(path),
+        # not the project: `-m` puts the working directory on `sys.path`
+        cwd="/",
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        sock = _connect(path)
+        if sock is not None:
+            return sock
+        time.sleep(0.05)
+    return None
+
+
+def run_client(argv: Sequence[str], path: str | None = None) -> int | None:
+    """Run flake8 in the daemon, starting one if none is running.
+
+    The daemon writes directly to our standard streams.
+
+    :returns:
+        The exit code, or ``None`` if the daemon could not be used and the
+        caller should run flake8 itself.
+    """
+    if not supported():
+        print("flake8: --daemon is not supported here", file=sys.stderr)
+        return None
+
+    if path is None:
+        path = socket_path()
+    try:
+        _ensure_private_dir(path)
+    except OSError as e:
+        print(f"flake8: not using the daemon: {e}", file=sys.stderr)
+        return None
+
+    sock = _connect(path) or _start(path)
+    if sock is None:
+        print("flake8: could not start the daemon", file=sys.stderr)
+        return None
+
+    with sock:
+        request = {
+            "argv": list(argv),
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        }
+        msg = json.dumps(request).encode() + b"\n"
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sent = socket.send_fds(sock, [msg], [0, 1, 2])
+        sock.sendall(msg[sent:])
+        try:
+            response = json.loads(_recv_message(sock))
+        except ConnectionError:
+            # it may have already written some output, don't run again
+            print("flake8: the daemon exited unexpectedly", file=sys.stderr)
+            return 1
+
+    return int(response["exit_code"])
+
+
+if __name__ == "__main__":
+    raise SystemExit(serve(sys.argv[1]))
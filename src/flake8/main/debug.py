@@ -4,10 +4,10 @@ from __future__ import annotations
 import platform
 from typing import Any
 
-from flake8.plugins.finder import Plugins
+from flake8.plugins import finder
 
 
-def information(version: str, plugins: Plugins) -> dict[str, Any]:
+def information(version: str, plugins: finder.Plugins) -> dict[str, Any]:
     """Generate the information to be printed for the bug report."""
     versions = sorted(
         {
@@ -22,6 +22,8 @@ def information(version: str, plugins: Plugins) -> dict[str, Any]:
             {"plugin": plugin, "version": version}
             for plugin, version in versions
         ],
+        # whether the plugins came from the plugin registry
+        "plugin_registry": finder.registry_status,
         "platform": {
             "python_implementation": platform.python_implementation(),
             "python_version": platform.python_version(),
@@ -18,6 +18,7 @@ def stage1_arg_parser() -> argparse.ArgumentParser:
     - ``--config``
     - ``--isolated``
     - ``--enable-extensions``
+    - ``--daemon``
     """
     parser = argparse.ArgumentParser(add_help=False)
 
@@ -75,6 +76,14 @@ def stage1_arg_parser() -> argparse.ArgumentParser:
         help="Require specific plugins to be installed before running",
     )
 
+    parser.add_argument(
+        "--daemon",
+        default=False,
+        action="store_true",
+        help="Run in a resident flake8 process (started on first use) "
+        "which keeps the plugins loaded between invocations.",
+    )
+
     return parser
 
 
@@ -117,6 +126,8 @@ def register_default_options(option_manager: OptionManager) -> None:
     - ``--exclude``
     - ``--extend-exclude``
     - ``--filename``
+    - ``--changed-since``
+    - ``--respect-gitignore``
     - ``--format``
     - ``--hang-closing``
     - ``--ignore``
@@ -131,9 +142,22 @@ def register_default_options(option_manager: OptionManager) -> None:
     - ``--show-source``
     - ``--statistics``
     - ``--exit-zero``
+    - ``--max-violations``
+    - ``--fail-fast``
     - ``-j``/``--jobs``
+    - ``--executor``
+    - ``--worker-max-files``
+    - ``--worker-max-memory``
+    - ``--filter-in-workers``
     - ``--tee``
+    - ``--stream-results``
+    - ``--reorder-buffer``
+    - ``--cache-dir``
+    - ``--watch``
     - ``--benchmark``
+    - ``--benchmark-json``
+    - ``--profile-plugins``
+    - ``--slowest``
     - ``--bug-report``
     """
     add_option = option_manager.add_option
@@ -194,6 +218,24 @@ def register_default_options(option_manager: OptionManager) -> None:
         "separated list. (Default: %(default)s)",
     )
 
+    add_option(
+        "--changed-since",
+        metavar="rev",
+        default=None,
+        help="Only check the files which git reports as added or modified "
+        "since this revision, including uncommitted changes and untracked "
+        "files.",
+    )
+
+    add_option(
+        "--respect-gitignore",
+        default=False,
+        parse_from_config=True,
+        action="store_true",
+        help="Find the files to check with git instead of walking the "
+        "directories so the files ignored by git are not checked.",
+    )
+
     add_option(
         "--stdin-display-name",
         default="stdin",
@@ -358,6 +400,25 @@ def register_default_options(option_manager: OptionManager) -> None:
         help='Exit with status code "0" even if there are errors.',
     )
 
+    add_option(
+        "--max-violations",
+        type=int,
+        metavar="n",
+        default=0,
+        parse_from_config=True,
+        help="Stop checking files once this many violations have been "
+        "reported. Results are reported as soon as each file is checked.",
+    )
+
+    add_option(
+        "--fail-fast",
+        action="store_const",
+        const=1,
+        dest="max_violations",
+        help="Stop checking files after the first reported violation, like "
+        "--max-violations=1.",
+    )
+
     add_option(
         "-j",
         "--jobs",
@@ -370,6 +431,47 @@ def register_default_options(option_manager: OptionManager) -> None:
         "(Default: %(default)s)",
     )
 
+    add_option(
+        "--executor",
+        choices=("process", "thread", "serial"),
+        default="process",
+        parse_from_config=True,
+        help="How to run checks in parallel: in subprocesses, in threads "
+        "(only faster on free-threaded builds of python) or not at all. "
+        "Plugins which are not thread safe fall back to subprocesses. "
+        "(Default: %(default)s)",
+    )
+
+    add_option(
+        "--worker-max-files",
+        type=int,
+        metavar="n",
+        default=0,
+        parse_from_config=True,
+        help="Replace each subprocess with a new one after it has checked "
+        "this many files. (Default: %(default)s, never)",
+    )
+
+    add_option(
+        "--worker-max-memory",
+        type=int,
+        metavar="megabytes",
+        default=0,
+        parse_from_config=True,
+        help="Replace the subprocesses with new ones once the memory used by "
+        "one of them has grown by more than this much since it started. "
+        "(Default: %(default)s, never)",
+    )
+
+    add_option(
+        "--filter-in-workers",
+        default=False,
+        parse_from_config=True,
+        action="store_true",
+        help="Apply --select, --ignore, --per-file-ignores and ``# noqa`` "
+        "in the subprocesses so only reported violations are sent back.",
+    )
+
     add_option(
         "--tee",
         default=False,
@@ -378,13 +480,78 @@ def register_default_options(option_manager: OptionManager) -> None:
         help="Write to stdout and output-file.",
     )
 
+    add_option(
+        "--stream-results",
+        default=False,
+        parse_from_config=True,
+        action="store_true",
+        help="Report the results for each file as soon as it has been "
+        "checked instead of after all files have been checked.",
+    )
+
+    add_option(
+        "--reorder-buffer",
+        type=int,
+        metavar="n",
+        default=0,
+        parse_from_config=True,
+        help="With --stream-results, hold back up to this many checked files "
+        "so that files are reported in the same order as without streaming. "
+        "(Default: %(default)s)",
+    )
+
+    add_option(
+        "--cache-dir",
+        default=None,
+        parse_from_config=True,
+        normalize_paths=True,
+        help="Directory in which to cache the results of checking each file. "
+        "Files whose contents, plugins and options are unchanged since a "
+        "previous run are not checked again.",
+    )
+
+    add_option(
+        "--watch",
+        default=False,
+        action="store_true",
+        help="Keep running after checking the files and check them again "
+        "(only the files which changed) whenever they change.",
+    )
+
     # Benchmarking
 
     add_option(
         "--benchmark",
         default=False,
         action="store_true",
-        help="Print benchmark information about this run of Flake8",
+        help="Print benchmark information about this run of Flake8.  The "
+        "tokens and logical lines are left out when no selected check needs "
+        "the files to be tokenized.",
+    )
+
+    add_option(
+        "--benchmark-json",
+        metavar="path",
+        default=None,
+        help="Write the benchmark information about this run of Flake8 to "
+        "this file as JSON.",
+    )
+
+    add_option(
+        "--profile-plugins",
+        default=False,
+        action="store_true",
+        help="Print the time spent running each plugin's checks",
+    )
+
+    add_option(
+        "--slowest",
+        type=int,
+        metavar="n",
+        default=0,
+        help="Print the n files which took the longest to check.  Their "
+        "logical lines and tokens are n/a when no selected check needs the "
+        "files to be tokenized.",
     )
 
     # Debugging
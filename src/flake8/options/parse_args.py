@@ -2,9 +2,12 @@
 from __future__ import annotations
 
 import argparse
+import configparser
 from collections.abc import Sequence
+from typing import NamedTuple
 
 import flake8
+from flake8 import utils
 from flake8.main import options
 from flake8.options import aggregator
 from flake8.options import config
@@ -14,8 +17,16 @@ from flake8.plugins import finder
 
 def parse_args(
     argv: Sequence[str],
+    phase_times: dict[str, float] | None = None,
 ) -> tuple[finder.Plugins, argparse.Namespace]:
-    """Procedure for parsing args, config, loading plugins."""
+    """Procedure for parsing args, config, loading plugins.
+
+    :param phase_times:
+        If given, the seconds spent in each phase are added to it.
+    """
+    if phase_times is None:
+        phase_times = {}
+
     prelim_parser = options.stage1_arg_parser()
 
     args0, rest = prelim_parser.parse_known_args(argv)
@@ -26,21 +37,34 @@ def parse_args(
 
     flake8.configure_logging(args0.verbose, args0.output_file)
 
-    cfg, cfg_dir = config.load_config(
-        config=args0.config,
-        extra=args0.append_config,
-        isolated=args0.isolated,
-    )
+    with utils.timed(phase_times, "config discovery"):
+        cfg, cfg_dir = config.load_config(
+            config=args0.config,
+            extra=args0.append_config,
+            isolated=args0.isolated,
+        )
 
-    plugin_opts = finder.parse_plugin_options(
-        cfg,
-        cfg_dir,
-        enable_extensions=args0.enable_extensions,
-        require_plugins=args0.require_plugins,
-    )
-    raw_plugins = finder.find_plugins(cfg, plugin_opts)
-    plugins = finder.load_plugins(raw_plugins, plugin_opts)
+    with utils.timed(phase_times, "plugin discovery"):
+        plugin_opts = finder.parse_plugin_options(
+            cfg,
+            cfg_dir,
+            enable_extensions=args0.enable_extensions,
+            require_plugins=args0.require_plugins,
+        )
+        raw_plugins = finder.find_plugins(cfg, plugin_opts)
+
+    with utils.timed(phase_times, "plugin import"):
+        plugins = finder.load_plugins(raw_plugins, plugin_opts)
+
+    with utils.timed(phase_times, "option aggregation"):
+        opts = _aggregate_options(prelim_parser, plugins, cfg, cfg_dir, rest)
 
+    return plugins, opts
+
+
+def _option_manager(
+    prelim_parser: argparse.ArgumentParser, plugins: finder.Plugins,
+) -> manager.OptionManager:
     option_manager = manager.OptionManager(
         version=flake8.__version__,
         plugin_versions=plugins.versions_str(),
@@ -49,9 +73,14 @@ def parse_args(
     )
     options.register_default_options(option_manager)
     option_manager.register_plugins(plugins)
+    return option_manager
 
-    opts = aggregator.aggregate_options(option_manager, cfg, cfg_dir, rest)
 
+def _parse_plugin_options(
+    option_manager: manager.OptionManager,
+    plugins: finder.Plugins,
+    opts: argparse.Namespace,
+) -> None:
     for loaded in plugins.all_plugins():
         parse_options = getattr(loaded.obj, "parse_options", None)
         if parse_options is None:
@@ -67,4 +96,59 @@ def parse_args(
         except TypeError:
             parse_options(opts)
 
-    return plugins, opts
+
+def _aggregate_options(
+    prelim_parser: argparse.ArgumentParser,
+    plugins: finder.Plugins,
+    cfg: configparser.RawConfigParser,
+    cfg_dir: str,
+    rest: list[str],
+) -> argparse.Namespace:
+    option_manager = _option_manager(prelim_parser, plugins)
+    opts = aggregator.aggregate_options(option_manager, cfg, cfg_dir, rest)
+    _parse_plugin_options(option_manager, plugins, opts)
+    return opts
+
+
+class RunPlan(NamedTuple):
+    """The checker plugins and options resolved by :func:`parse_args`.
+
+    Unlike the loaded plugins this can be sent to worker processes started
+    with ``spawn`` or ``forkserver`` so they do not need to read the
+    configuration or scan the installed distributions again.
+    """
+
+    tree: list[finder.Plugin]
+    logical_line: list[finder.Plugin]
+    physical_line: list[finder.Plugin]
+    options: argparse.Namespace
+
+
+def make_run_plan(
+    checkers: finder.Checkers, opts: argparse.Namespace,
+) -> RunPlan:
+    """Make the :class:`RunPlan` for the checkers and options."""
+    return RunPlan(
+        tree=[loaded.plugin for loaded in checkers.tree],
+        logical_line=[loaded.plugin for loaded in checkers.logical_line],
+        physical_line=[loaded.plugin for loaded in checkers.physical_line],
+        options=opts,
+    )
+
+
+def load_run_plan(
+    plan: RunPlan,
+) -> tuple[finder.Checkers, argparse.Namespace]:
+    """Import the plugins of the plan and give them their options.
+
+    This is equivalent to the :func:`parse_args` which made the plan.
+    """
+    checkers = finder.Checkers(
+        tree=[finder._load_plugin(p) for p in plan.tree],
+        logical_line=[finder._load_plugin(p) for p in plan.logical_line],
+        physical_line=[finder._load_plugin(p) for p in plan.physical_line],
+    )
+    plugins = finder.Plugins(checkers=checkers, reporters={}, disabled=[])
+    option_manager = _option_manager(options.stage1_arg_parser(), plugins)
+    _parse_plugin_options(option_manager, plugins, plan.options)
+    return checkers, plan.options
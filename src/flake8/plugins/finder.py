@@ -2,16 +2,23 @@
 from __future__ import annotations
 
 import configparser
+import contextlib
+import hashlib
 import importlib.metadata
 import inspect
 import itertools
+import json
 import logging
+import os
 import sys
+import tempfile
+from collections.abc import Callable
 from collections.abc import Generator
 from collections.abc import Iterable
 from typing import Any
 from typing import NamedTuple
 
+import flake8
 from flake8 import utils
 from flake8.defaults import VALID_CODE_PREFIX
 from flake8.exceptions import ExecutionError
@@ -26,6 +33,21 @@ BANNED_PLUGINS = {
     "flake8-per-file-ignores": "3.7",
 }
 
+# plugins known to be safe to run from multiple threads which do not (yet)
+# declare ``thread_safe = True`` themselves
+THREAD_SAFE_PLUGINS = frozenset(("mccabe",))
+
+# distribution plugins discovered ahead of time by a long-lived process (see
+# :mod:`flake8.main.daemon`) which forks to handle each invocation
+_prefound: list[Plugin] | None = None
+
+# bump when the format of the plugin registry changes
+_REGISTRY_VERSION = 1
+# how the distribution plugins were found by :func:`find_plugins`: from the
+# registry ("hit"), by scanning the distributions ("miss" / "disabled") or
+# ahead of time by the daemon ("prefound")
+registry_status = "disabled"
+
 
 class Plugin(NamedTuple):
     """A plugin before loading."""
@@ -52,6 +74,19 @@ class LoadedPlugin(NamedTuple):
         """Return the name for use in user-facing / error messages."""
         return f"{self.plugin.package}[{self.entry_name}]"
 
+    @property
+    def thread_safe(self) -> bool:
+        """Return whether the plugin may check several files concurrently."""
+        return (
+            getattr(self.obj, "thread_safe", False)
+            or self.plugin.package in THREAD_SAFE_PLUGINS
+        )
+
+    @property
+    def code_prefixes(self) -> tuple[str, ...]:
+        """Return the prefixes of the codes the plugin may report."""
+        return tuple(getattr(self.obj, "code_prefixes", (self.entry_name,)))
+
 
 class Checkers(NamedTuple):
     """Classified plugins needed for checking."""
@@ -173,7 +208,15 @@ def _flake8_plugins(
             yield Plugin(name, version, ep)
 
 
-def _find_importlib_plugins() -> Generator[Plugin]:
+def _warn_banned(name: str) -> None:
+    LOG.warning(
+        "%s plugin is obsolete in flake8>=%s", name, BANNED_PLUGINS[name],
+    )
+
+
+def _find_importlib_plugins(
+    banned: list[str] | None = None,
+) -> Generator[Plugin]:
     # some misconfigured pythons (RHEL) have things on `sys.path` twice
     seen = set()
     for dist in importlib.metadata.distributions():
@@ -193,11 +236,9 @@ def _find_importlib_plugins() -> Generator[Plugin]:
             seen.add(meta["name"])
 
         if meta["name"] in BANNED_PLUGINS:
-            LOG.warning(
-                "%s plugin is obsolete in flake8>=%s",
-                meta["name"],
-                BANNED_PLUGINS[meta["name"]],
-            )
+            _warn_banned(meta["name"])
+            if banned is not None:
+                banned.append(meta["name"])
             continue
         elif meta["name"] == "flake8":
             # special case flake8 which provides plugins for pyflakes /
@@ -210,6 +251,156 @@ def _find_importlib_plugins() -> Generator[Plugin]:
                 yield Plugin(meta["name"], meta["version"], ep)
 
 
+def _registry_path() -> str | None:
+    """Return the path of the plugin registry for this python environment.
+
+    :returns:
+        The path or ``None`` if there is no cache directory to store it in.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if not cache_home:
+        home = os.path.expanduser("~")
+        if home == "~":
+            return None
+        cache_home = os.path.join(home, ".cache")
+
+    env = f"{sys.executable}\0{sys.prefix}\0{flake8.__version__}"
+    digest = hashlib.sha256(env.encode()).hexdigest()[:16]
+    return os.path.join(cache_home, "flake8", f"plugins-{digest}.json")
+
+
+def _environment_stamp() -> list[tuple[str, int]]:
+    """Return the modification times of everything the plugins come from.
+
+    These are the directories on ``sys.path`` holding distribution metadata
+    (which change when a distribution is installed or removed) and the
+    ``.dist-info`` / ``.egg-info`` directories in them (which change when
+    one is replaced).  The working directory is left out: it is on
+    ``sys.path`` under ``python -m`` and changes with every edit.
+    """
+    cwd = os.getcwd()
+    ret = []
+    for path in sys.path:
+        if not path or os.path.abspath(path) == cwd:
+            continue
+        try:
+            with os.scandir(path) as it:
+                metadata = sorted(
+                    (entry for entry in it if _is_metadata(entry.name)),
+                    key=lambda entry: entry.name,
+                )
+            if metadata:
+                ret.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            continue
+        for entry in metadata:
+            with contextlib.suppress(OSError):
+                ret.append((entry.path, entry.stat().st_mtime_ns))
+    return ret
+
+
+def _is_metadata(name: str) -> bool:
+    return name.endswith((".dist-info", ".egg-info"))
+
+
+def _load_registry(
+    path: str, stamp: list[tuple[str, int]],
+) -> tuple[list[Plugin], list[str]] | None:
+    try:
+        with open(path, encoding="UTF-8") as f:
+            registry = json.load(f)
+        if (
+            registry["version"] != _REGISTRY_VERSION
+            or [tuple(s) for s in registry["stamp"]] != stamp
+        ):
+            return None
+        plugins = [
+            Plugin(
+                package,
+                version,
+                importlib.metadata.EntryPoint(name, value, group),
+            )
+            for package, version, name, value, group in registry["plugins"]
+        ]
+        return plugins, registry["banned"]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        LOG.debug("could not read the plugin registry %s: %s", path, e)
+        return None
+
+
+def _save_registry(
+    path: str,
+    stamp: list[tuple[str, int]],
+    plugins: list[Plugin],
+    banned: list[str],
+) -> None:
+    registry = {
+        "version": _REGISTRY_VERSION,
+        "stamp": stamp,
+        "plugins": [
+            (
+                plugin.package,
+                plugin.version,
+                plugin.entry_point.name,
+                plugin.entry_point.value,
+                plugin.entry_point.group,
+            )
+            for plugin in plugins
+        ],
+        "banned": banned,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "w", encoding="UTF-8") as f:
+            json.dump(registry, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        LOG.debug("could not write the plugin registry %s: %s", path, e)
+
+
+def _find_importlib_plugins_cached() -> list[Plugin]:
+    """Find the distribution plugins using the persistent registry.
+
+    The registry is only used while nothing was installed, removed or
+    replaced since it was written, otherwise the distributions are scanned
+    again and the registry is rewritten.
+    """
+    global registry_status
+
+    path = _registry_path()
+    if path is None:
+        registry_status = "disabled"
+        return list(_find_importlib_plugins())
+
+    stamp = _environment_stamp()
+    cached = _load_registry(path, stamp)
+    if cached is not None:
+        registry_status = "hit"
+        plugins, banned = cached
+        for name in banned:
+            _warn_banned(name)
+        return plugins
+
+    registry_status = "miss"
+    banned = []
+    plugins = list(_find_importlib_plugins(banned))
+    _save_registry(path, stamp, plugins, banned)
+    return plugins
+
+
+@contextlib.contextmanager
+def _prefind() -> Generator[list[Plugin]]:
+    # scanning ``importlib.metadata.distributions()`` is one of the more
+    # expensive parts of startup -- do it once for every forked invocation
+    global _prefound
+    _prefound = list(_find_importlib_plugins())
+    try:
+        yield _prefound
+    finally:
+        _prefound = None
+
+
 def _find_local_plugins(
     cfg: configparser.RawConfigParser,
 ) -> Generator[Plugin]:
@@ -249,7 +440,14 @@ def find_plugins(
     opts: PluginOptions,
 ) -> list[Plugin]:
     """Discovers all plugins (but does not load them)."""
-    ret = [*_find_importlib_plugins(), *_find_local_plugins(cfg)]
+    global registry_status
+
+    if _prefound is not None:
+        registry_status = "prefound"
+        importlib_plugins: Iterable[Plugin] = _prefound
+    else:
+        importlib_plugins = _find_importlib_plugins_cached()
+    ret = [*importlib_plugins, *_find_local_plugins(cfg)]
 
     # for determinism, sort the list
     ret.sort()
@@ -352,6 +550,30 @@ def _classify_plugins(
     )
 
 
+def prune_checkers(
+    checkers: Checkers,
+    selects_any: Callable[[str], bool],
+) -> Checkers:
+    """Remove the checkers which cannot report any selected code.
+
+    :param selects_any:
+        Whether any code starting with the given prefix may be reported.
+    """
+
+    def _needed(loaded: LoadedPlugin) -> bool:
+        if any(selects_any(prefix) for prefix in loaded.code_prefixes):
+            return True
+        else:
+            LOG.debug("%s reports no selected codes", loaded.display_name)
+            return False
+
+    return Checkers(
+        tree=[p for p in checkers.tree if _needed(p)],
+        logical_line=[p for p in checkers.logical_line if _needed(p)],
+        physical_line=[p for p in checkers.physical_line if _needed(p)],
+    )
+
+
 def load_plugins(
     plugins: list[Plugin],
     opts: PluginOptions,
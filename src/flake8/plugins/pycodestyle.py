@@ -2,7 +2,9 @@
 # fmt: off
 from __future__ import annotations
 
+import argparse
 from collections.abc import Generator
+from collections.abc import Sequence
 from typing import Any
 
 from pycodestyle import ambiguous_identifier as _ambiguous_identifier
@@ -36,8 +38,66 @@ from pycodestyle import whitespace_around_operator as _whitespace_around_operato
 from pycodestyle import whitespace_before_comment as _whitespace_before_comment
 from pycodestyle import whitespace_before_parameters as _whitespace_before_parameters  # noqa: E501
 
+from flake8.options.manager import OptionManager
+from flake8.style_guide import Decision
+from flake8.style_guide import DecisionEngine
 
-def pycodestyle_logical(
+# the codes each check may report
+CHECK_CODES: dict[str, tuple[str, ...]] = {
+    "ambiguous_identifier": ("E741", "E742", "E743"),
+    "bare_except": ("E722",),
+    "blank_lines": ("E301", "E302", "E303", "E304", "E305", "E306"),
+    "break_after_binary_operator": ("W504",),
+    "break_before_binary_operator": ("W503",),
+    "comparison_negative": ("E713", "E714"),
+    "comparison_to_singleton": ("E711", "E712"),
+    "comparison_type": ("E721",),
+    "compound_statements": ("E701", "E702", "E703", "E704", "E731"),
+    "continued_indentation": ("E121", "E122", "E123", "E124", "E125", "E126", "E127", "E128", "E129", "E131", "E133"),  # noqa: E501
+    "explicit_line_join": ("E502",),
+    "extraneous_whitespace": ("E201", "E202", "E203", "E204"),
+    "imports_on_separate_lines": ("E401",),
+    "indentation": ("E111", "E112", "E113", "E114", "E115", "E116", "E117"),
+    "maximum_doc_length": ("W505",),
+    "maximum_line_length": ("E501",),
+    "missing_whitespace": ("E225", "E226", "E227", "E228", "E231"),
+    "missing_whitespace_after_keyword": ("E275",),
+    "module_imports_on_top_of_file": ("E402",),
+    "python_3000_invalid_escape_sequence": ("W605",),
+    "tabs_obsolete": ("W191",),
+    "tabs_or_spaces": ("E101",),
+    "trailing_blank_lines": ("W292", "W391"),
+    "trailing_whitespace": ("W291", "W293"),
+    "whitespace_around_comma": ("E241", "E242"),
+    "whitespace_around_keywords": ("E271", "E272", "E273", "E274"),
+    "whitespace_around_named_parameter_equals": ("E251", "E252"),
+    "whitespace_around_operator": ("E221", "E222", "E223", "E224"),
+    "whitespace_before_comment": ("E261", "E262", "E265", "E266"),
+    "whitespace_before_parameters": ("E211",),
+}
+# the checks which may report a selected code
+_selected = set(CHECK_CODES)
+
+
+def _select_checks(
+    option_manager: OptionManager,
+    options: argparse.Namespace,
+    args: Sequence[str],
+) -> None:
+    """Only run the checks which may report a selected code."""
+    decider = DecisionEngine(options)
+    _selected.clear()
+    _selected.update(
+        name
+        for name, codes in CHECK_CODES.items()
+        if any(
+            decider.decision_for(code) is Decision.Selected
+            for code in codes
+        )
+    )
+
+
+def pycodestyle_logical(  # noqa: C901
     blank_before: Any,
     blank_lines: Any,
     checker_state: Any,
@@ -57,34 +117,64 @@ def pycodestyle_logical(
     verbose: Any,
 ) -> Generator[tuple[int, str]]:
     """Run pycodestyle logical checks."""
-    yield from _ambiguous_identifier(logical_line, tokens)
-    yield from _bare_except(logical_line, noqa)
-    yield from _blank_lines(logical_line, blank_lines, indent_level, line_number, blank_before, previous_logical, previous_unindented_logical_line, previous_indent_level, lines)  # noqa: E501
-    yield from _break_after_binary_operator(logical_line, tokens)
-    yield from _break_before_binary_operator(logical_line, tokens)
-    yield from _comparison_negative(logical_line)
-    yield from _comparison_to_singleton(logical_line, noqa)
-    yield from _comparison_type(logical_line, noqa)
-    yield from _compound_statements(logical_line)
-    yield from _continued_indentation(logical_line, tokens, indent_level, hang_closing, indent_char, indent_size, noqa, verbose)  # noqa: E501
-    yield from _explicit_line_join(logical_line, tokens)
-    yield from _extraneous_whitespace(logical_line)
-    yield from _imports_on_separate_lines(logical_line)
-    yield from _indentation(logical_line, previous_logical, indent_char, indent_level, previous_indent_level, indent_size)  # noqa: E501
-    yield from _maximum_doc_length(logical_line, max_doc_length, noqa, tokens)
-    yield from _missing_whitespace(logical_line, tokens)
-    yield from _missing_whitespace_after_keyword(logical_line, tokens)
-    yield from _module_imports_on_top_of_file(logical_line, indent_level, checker_state, noqa)  # noqa: E501
-    yield from _python_3000_invalid_escape_sequence(logical_line, tokens, noqa)
-    yield from _whitespace_around_comma(logical_line)
-    yield from _whitespace_around_keywords(logical_line)
-    yield from _whitespace_around_named_parameter_equals(logical_line, tokens)
-    yield from _whitespace_around_operator(logical_line)
-    yield from _whitespace_before_comment(logical_line, tokens)
-    yield from _whitespace_before_parameters(logical_line, tokens)
+    if "ambiguous_identifier" in _selected:
+        yield from _ambiguous_identifier(logical_line, tokens)
+    if "bare_except" in _selected:
+        yield from _bare_except(logical_line, noqa)
+    if "blank_lines" in _selected:
+        yield from _blank_lines(logical_line, blank_lines, indent_level, line_number, blank_before, previous_logical, previous_unindented_logical_line, previous_indent_level, lines)  # noqa: E501
+    if "break_after_binary_operator" in _selected:
+        yield from _break_after_binary_operator(logical_line, tokens)
+    if "break_before_binary_operator" in _selected:
+        yield from _break_before_binary_operator(logical_line, tokens)
+    if "comparison_negative" in _selected:
+        yield from _comparison_negative(logical_line)
+    if "comparison_to_singleton" in _selected:
+        yield from _comparison_to_singleton(logical_line, noqa)
+    if "comparison_type" in _selected:
+        yield from _comparison_type(logical_line, noqa)
+    if "compound_statements" in _selected:
+        yield from _compound_statements(logical_line)
+    if "continued_indentation" in _selected:
+        yield from _continued_indentation(logical_line, tokens, indent_level, hang_closing, indent_char, indent_size, noqa, verbose)  # noqa: E501
+    if "explicit_line_join" in _selected:
+        yield from _explicit_line_join(logical_line, tokens)
+    if "extraneous_whitespace" in _selected:
+        yield from _extraneous_whitespace(logical_line)
+    if "imports_on_separate_lines" in _selected:
+        yield from _imports_on_separate_lines(logical_line)
+    if "indentation" in _selected:
+        yield from _indentation(logical_line, previous_logical, indent_char, indent_level, previous_indent_level, indent_size)  # noqa: E501
+    if "maximum_doc_length" in _selected:
+        yield from _maximum_doc_length(logical_line, max_doc_length, noqa, tokens)  # noqa: E501
+    if "missing_whitespace" in _selected:
+        yield from _missing_whitespace(logical_line, tokens)
+    if "missing_whitespace_after_keyword" in _selected:
+        yield from _missing_whitespace_after_keyword(logical_line, tokens)
+    if "module_imports_on_top_of_file" in _selected:
+        yield from _module_imports_on_top_of_file(logical_line, indent_level, checker_state, noqa)  # noqa: E501
+    if "python_3000_invalid_escape_sequence" in _selected:
+        yield from _python_3000_invalid_escape_sequence(logical_line, tokens, noqa)  # noqa: E501
+    if "whitespace_around_comma" in _selected:
+        yield from _whitespace_around_comma(logical_line)
+    if "whitespace_around_keywords" in _selected:
+        yield from _whitespace_around_keywords(logical_line)
+    if "whitespace_around_named_parameter_equals" in _selected:
+        yield from _whitespace_around_named_parameter_equals(logical_line, tokens)  # noqa: E501
+    if "whitespace_around_operator" in _selected:
+        yield from _whitespace_around_operator(logical_line)
+    if "whitespace_before_comment" in _selected:
+        yield from _whitespace_before_comment(logical_line, tokens)
+    if "whitespace_before_parameters" in _selected:
+        yield from _whitespace_before_parameters(logical_line, tokens)
 
 
-def pycodestyle_physical(
+pycodestyle_logical.thread_safe = True  # type: ignore[attr-defined]
+pycodestyle_logical.code_prefixes = ("E", "W")  # type: ignore[attr-defined]
+pycodestyle_logical.parse_options = _select_checks  # type: ignore[attr-defined]  # noqa: E501
+
+
+def pycodestyle_physical(  # noqa: C901
     indent_char: Any,
     line_number: Any,
     lines: Any,
@@ -95,18 +185,28 @@ def pycodestyle_physical(
     total_lines: Any,
 ) -> Generator[tuple[int, str]]:
     """Run pycodestyle physical checks."""
-    ret = _maximum_line_length(physical_line, max_line_length, multiline, line_number, noqa)  # noqa: E501
-    if ret is not None:
-        yield ret
-    ret = _tabs_obsolete(physical_line)
-    if ret is not None:
-        yield ret
-    ret = _tabs_or_spaces(physical_line, indent_char)
-    if ret is not None:
-        yield ret
-    ret = _trailing_blank_lines(physical_line, lines, line_number, total_lines)
-    if ret is not None:
-        yield ret
-    ret = _trailing_whitespace(physical_line)
-    if ret is not None:
-        yield ret
+    if "maximum_line_length" in _selected:
+        ret = _maximum_line_length(physical_line, max_line_length, multiline, line_number, noqa)  # noqa: E501
+        if ret is not None:
+            yield ret
+    if "tabs_obsolete" in _selected:
+        ret = _tabs_obsolete(physical_line)
+        if ret is not None:
+            yield ret
+    if "tabs_or_spaces" in _selected:
+        ret = _tabs_or_spaces(physical_line, indent_char)
+        if ret is not None:
+            yield ret
+    if "trailing_blank_lines" in _selected:
+        ret = _trailing_blank_lines(physical_line, lines, line_number, total_lines)  # noqa: E501
+        if ret is not None:
+            yield ret
+    if "trailing_whitespace" in _selected:
+        ret = _trailing_whitespace(physical_line)
+        if ret is not None:
+            yield ret
+
+
+pycodestyle_physical.thread_safe = True  # type: ignore[attr-defined]
+pycodestyle_physical.code_prefixes = ("E", "W")  # type: ignore[attr-defined]
+pycodestyle_physical.parse_options = _select_checks  # type: ignore[attr-defined]  # noqa: E501
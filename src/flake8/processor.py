@@ -271,10 +271,33 @@ class FileProcessor:
         return ret
 
     def generate_tokens(self) -> Generator[tokenize.TokenInfo]:
-        """Tokenize the file and yield the tokens."""
-        for token in tokenize.generate_tokens(self.next_line):
+        """Yield the tokens of the file, updating state as they are read.
+
+        The tokens are shared with :attr:`file_tokens` so the file is only
+        tokenized once.
+        """
+        try:
+            file_tokens = self.file_tokens
+        except (tokenize.TokenError, SyntaxError):
+            # tokenize incrementally so the tokens preceding the error are
+            # still checked before the error is raised
+            file_tokens = None
+
+        if file_tokens is None:
+            for token in tokenize.generate_tokens(self.next_line):
+                if token[2][0] > self.total_lines:
+                    break
+                self.tokens.append(token)
+                yield token
+            return
+
+        for token in file_tokens:
             if token[2][0] > self.total_lines:
                 break
+            # the tokenizer has read every line up to the end of the token
+            end_line = min(token[3][0], self.total_lines)
+            while self.line_number < end_line:
+                self.next_line()
             self.tokens.append(token)
             yield token
 
@@ -129,3 +129,28 @@ class Statistic:
     def increment(self) -> None:
         """Increment the number of times we've seen this error in this file."""
         self.count += 1
+
+
+class PluginTiming(NamedTuple):
+    """Time spent running one type of check of a plugin.
+
+    ``check_type`` is one of ``tree``, ``logical_line`` or
+    ``physical_line``.
+    """
+
+    plugin: str
+    check_type: str
+    seconds: float
+    calls: int
+    files: int
+
+
+class FileTiming(NamedTuple):
+    """Time spent checking a file."""
+
+    filename: str
+    seconds: float
+    physical_lines: int
+    # ``None`` when the file was not tokenized (no check needs the tokens)
+    logical_lines: int | None
+    tokens: int | None
@@ -66,16 +66,37 @@ def _select_ignore(
     return tuple(sorted(ret, reverse=True))
 
 
+# flags of the prefix table compiled by the DecisionEngine
+_SELECTED_EXPLICITLY = 1
+_SELECTED = 2
+_IGNORED_EXPLICITLY = 4
+_IGNORED = 8
+
+
+def _add_prefixes(
+    table: dict[str, int], prefixes: Sequence[str], flags: int,
+) -> None:
+    for prefix in prefixes:
+        table[prefix] = table.get(prefix, 0) | flags
+
+
 class DecisionEngine:
     """A class for managing the decision process around violations.
 
     This contains the logic for whether a violation should be reported or
     ignored.
+
+    The select and ignore rules are compiled into a table of code prefixes
+    so a decision only needs a lookup for each prefix of the code.  Engines
+    for the ``per-file-ignores`` are created with :meth:`with_ignored` and
+    only store the codes they add.
     """
 
     def __init__(self, options: argparse.Namespace) -> None:
         """Initialize the engine."""
         self.cache: dict[str, Decision] = {}
+        self._parent: DecisionEngine | None = None
+        self._added: tuple[str, ...] = ()
 
         self.selected_explicitly = _explicitly_chosen(
             option=options.select,
@@ -99,6 +120,62 @@ class DecisionEngine:
             extend=options.extend_ignore,
         )
 
+        table: dict[str, int] = {}
+        _add_prefixes(table, self.selected, _SELECTED)
+        _add_prefixes(table, self.selected_explicitly, _SELECTED_EXPLICITLY)
+        _add_prefixes(table, self.ignored, _IGNORED)
+        _add_prefixes(table, self.ignored_explicitly, _IGNORED_EXPLICITLY)
+        self._table = table
+        # prefixes added by :meth:`with_ignored`
+        self._delta: dict[str, int] = {}
+
+    def with_ignored(self, codes: Sequence[str]) -> DecisionEngine:
+        """Return an engine which additionally ignores ``codes``.
+
+        This is equivalent to a new engine with ``codes`` added to
+        ``--extend-ignore`` but shares the compiled table and the decisions
+        for codes not matching ``codes`` with this engine.
+        """
+        engine = copy.copy(self)
+        engine.cache = {}
+        engine._parent = self
+        engine._added = tuple(codes)
+        engine._delta = dict(self._delta)
+        _add_prefixes(engine._delta, codes, _IGNORED | _IGNORED_EXPLICITLY)
+        engine.ignored_explicitly = tuple(
+            sorted((*self.ignored_explicitly, *codes), reverse=True),
+        )
+        engine.ignored = tuple(sorted((*self.ignored, *codes), reverse=True))
+        return engine
+
+    def selects_any(self, prefix: str) -> bool:
+        """Determine if any code starting with ``prefix`` may be selected.
+
+        A longer select rule could select some of the codes so this only
+        returns ``False`` when all of them are certainly ignored.
+        """
+        if self.decision_for(prefix) is Decision.Selected:
+            return True
+        return any(
+            len(code) > len(prefix) and code.startswith(prefix)
+            for code in (*self.selected, *self.selected_explicitly)
+        )
+
+    def _prefix_flags(self, code: str) -> Generator[tuple[str, int]]:
+        """Yield the matching prefixes of the code, longest first."""
+        table, delta = self._table, self._delta
+        for i in range(len(code), -1, -1):
+            prefix = code[:i]
+            flags = table.get(prefix, 0) | delta.get(prefix, 0)
+            if flags:
+                yield prefix, flags
+
+    def _flags(self, code: str) -> int:
+        ret = 0
+        for _, flags in self._prefix_flags(code):
+            ret |= flags
+        return ret
+
     def was_selected(self, code: str) -> Selected | Ignored:
         """Determine if the code has been selected by the user.
 
@@ -110,9 +187,10 @@ class DecisionEngine:
             Ignored.Implicitly if the selected list is not empty but no match
             was found.
         """
-        if code.startswith(self.selected_explicitly):
+        flags = self._flags(code)
+        if flags & _SELECTED_EXPLICITLY:
             return Selected.Explicitly
-        elif code.startswith(self.selected):
+        elif flags & _SELECTED:
             return Selected.Implicitly
         else:
             return Ignored.Implicitly
@@ -129,9 +207,10 @@ class DecisionEngine:
             Selected.Implicitly if the ignored list is not empty but no match
             was found.
         """
-        if code.startswith(self.ignored_explicitly):
+        flags = self._flags(code)
+        if flags & _IGNORED_EXPLICITLY:
             return Ignored.Explicitly
-        elif code.startswith(self.ignored):
+        elif flags & _IGNORED:
             return Ignored.Implicitly
         else:
             return Selected.Implicitly
@@ -169,8 +248,9 @@ class DecisionEngine:
             selected is Selected.Implicitly and ignored is Ignored.Implicitly
         ):
             # we only get here if it was in both lists: longest prefix wins
-            select = next(s for s in self.selected if code.startswith(s))
-            ignore = next(s for s in self.ignored if code.startswith(s))
+            prefixes = tuple(self._prefix_flags(code))
+            select = next(p for p, flags in prefixes if flags & _SELECTED)
+            ignore = next(p for p, flags in prefixes if flags & _IGNORED)
             if len(select) > len(ignore):
                 return Decision.Selected
             else:
@@ -193,9 +273,13 @@ class DecisionEngine:
         """
         decision = self.cache.get(code)
         if decision is None:
-            decision = self.make_decision(code)
+            if self._parent is not None and not code.startswith(self._added):
+                # the code is decided the same way as by the parent
+                decision = self._parent.decision_for(code)
+            else:
+                decision = self.make_decision(code)
+                LOG.debug('"%s" will be "%s"', code, decision)
             self.cache[code] = decision
-            LOG.debug('"%s" will be "%s"', code, decision)
         return decision
 
 
@@ -218,12 +302,19 @@ class StyleGuideManager:
         self.decider = decider or DecisionEngine(options)
         self.style_guides: list[StyleGuide] = []
         self.default_style_guide = StyleGuide(
-            options, formatter, self.stats, decider=decider,
+            options, formatter, self.stats, decider=self.decider,
         )
         self.style_guides = [
             self.default_style_guide,
             *self.populate_style_guides_with(options),
         ]
+        # the most specific (longest) pattern matching a file wins
+        self._per_file_guides = sorted(
+            self.style_guides[1:], key=lambda g: -len(g.filename or ""),
+        )
+        self._per_file_matcher = utils.FilenameMatcher(
+            [g.filename or "" for g in self._per_file_guides],
+        )
 
         self.style_guide_for = functools.cache(self._style_guide_for)
 
@@ -245,10 +336,12 @@ class StyleGuideManager:
 
     def _style_guide_for(self, filename: str) -> StyleGuide:
         """Find the StyleGuide for the filename in particular."""
-        return max(
-            (g for g in self.style_guides if g.applies_to(filename)),
-            key=lambda g: len(g.filename or ""),
-        )
+        i = self._per_file_matcher.first_match(filename)
+        if i is None:
+            return self.default_style_guide
+        guide = self._per_file_guides[i]
+        LOG.debug('%r applies to "%s"', guide, filename)
+        return guide
 
     @contextlib.contextmanager
     def processing_file(self, filename: str) -> Generator[StyleGuide]:
@@ -291,6 +384,35 @@ class StyleGuideManager:
             code, filename, line_number, column_number, text, physical_line,
         )
 
+    def filter_results(
+        self,
+        filename: str,
+        results: Sequence[tuple[str, int, int, str, str | None]],
+    ) -> list[tuple[str, int, int, str, str | None]]:
+        """Return only the results which :meth:`handle_error` would report.
+
+        :param filename:
+            The file in which the results were found.
+        :param results:
+            The ``(code, line_number, column_number, text, physical_line)``
+            results of checking the file.
+        """
+        guide = self.style_guide_for(filename)
+        return [
+            result
+            for result in results
+            if guide.is_reported(
+                Violation(
+                    result[0],
+                    filename,
+                    result[1],
+                    (result[2] or 0) + 1,
+                    result[3],
+                    result[4],
+                ),
+            )
+        ]
+
 
 class StyleGuide:
     """Manage a Flake8 user's style guide."""
@@ -326,11 +448,17 @@ class StyleGuide:
     ) -> StyleGuide:
         """Create a copy of this style guide with different values."""
         filename = filename or self.filename
-        options = copy.deepcopy(self.options)
-        options.extend_ignore = options.extend_ignore or []
-        options.extend_ignore.extend(extend_ignore_with or [])
+        # the options are only shared, the copy gets its own --extend-ignore
+        options = copy.copy(self.options)
+        options.extend_ignore = [
+            *(options.extend_ignore or []), *(extend_ignore_with or []),
+        ]
         return StyleGuide(
-            options, self.formatter, self.stats, filename=filename,
+            options,
+            self.formatter,
+            self.stats,
+            filename=filename,
+            decider=self.decider.with_ignored(extend_ignore_with or ()),
         )
 
     @contextlib.contextmanager
@@ -401,7 +529,6 @@ class StyleGuide:
             1 if the error was reported. 0 if it was ignored. This is to allow
             for counting of the number of errors found that were not ignored.
         """
-        disable_noqa = self.options.disable_noqa
         # NOTE(sigmavirus24): Apparently we're provided with 0-indexed column
         # numbers so we have to offset that here.
         if not column_number:
@@ -414,12 +541,21 @@ class StyleGuide:
             text,
             physical_line,
         )
-        error_is_selected = (
-            self.should_report_error(error.code) is Decision.Selected
-        )
-        is_not_inline_ignored = error.is_inline_ignored(disable_noqa) is False
-        if error_is_selected and is_not_inline_ignored:
+        if self.is_reported(error):
             self.formatter.handle(error)
             self.stats.record(error)
             return 1
         return 0
+
+    def is_reported(self, error: Violation) -> bool:
+        """Determine if the violation is selected and not ignored by noqa.
+
+        :param error:
+            The violation found by a check.
+        """
+        disable_noqa = self.options.disable_noqa
+        error_is_selected = (
+            self.should_report_error(error.code) is Decision.Selected
+        )
+        is_not_inline_ignored = error.is_inline_ignored(disable_noqa) is False
+        return error_is_selected and is_not_inline_ignored
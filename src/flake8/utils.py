@@ -1,6 +1,7 @@
 """Utility methods for flake8."""
 from __future__ import annotations
 
+import contextlib
 import fnmatch as _fnmatch
 import functools
 import io
@@ -10,7 +11,9 @@ import platform
 import re
 import sys
 import textwrap
+import time
 import tokenize
+from collections.abc import Generator
 from collections.abc import Sequence
 from re import Pattern
 from typing import NamedTuple
@@ -262,6 +265,100 @@ def matches_filename(
     return match
 
 
+_GLOB_CHARS = frozenset("*?[")
+
+
+class FilenameMatcher:
+    """Match paths against many :func:`fnmatch` patterns at once.
+
+    This matches like :func:`matches_filename` (against the basename and
+    the absolute path) but finds the first matching pattern without trying
+    each one: literal patterns are looked up in a dict, patterns which are
+    a literal followed by ``*`` by their prefix and the rest are combined
+    into a single regular expression.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        """Compile the patterns.
+
+        :param patterns:
+            The patterns, in order of precedence.
+        """
+        self._literals: dict[str, int] = {}
+        self._prefixes: dict[str, int] = {}
+        globs = []
+        for i, pattern in enumerate(patterns):
+            pattern = os.path.normcase(pattern)
+            if not _GLOB_CHARS.intersection(pattern):
+                self._literals.setdefault(pattern, i)
+            elif (
+                pattern.endswith("*")
+                and not _GLOB_CHARS.intersection(pattern[:-1])
+            ):
+                self._prefixes.setdefault(pattern[:-1], i)
+            else:
+                globs.append((i, f"(?P<p{i}>{_fnmatch.translate(pattern)})"))
+
+        self._prefix_lengths = sorted({len(p) for p in self._prefixes})
+        self._globs = [i for i, _ in globs]
+        self._globs_re = re.compile("|".join(r for _, r in globs) or "(?!)")
+
+    def first_match_name(self, name: str) -> int | None:
+        """Return the index of the first pattern matching the whole name.
+
+        Unlike :meth:`first_match` this matches like :func:`fnmatch`: the
+        name is matched as is.
+        """
+        name = os.path.normcase(name)
+        matches = []
+        literal = self._literals.get(name)
+        if literal is not None:
+            matches.append(literal)
+        for length in self._prefix_lengths:
+            if length > len(name):
+                break
+            prefix = self._prefixes.get(name[:length])
+            if prefix is not None:
+                matches.append(prefix)
+        # the alternatives are tried in order so the first one matching has
+        # the lowest index
+        match = self._globs_re.match(name)
+        if match is not None:
+            matches.append(
+                next(
+                    i
+                    for i in self._globs
+                    if match.group(f"p{i}") is not None
+                ),
+            )
+        return min(matches, default=None)
+
+    def first_match(self, path: str) -> int | None:
+        """Return the index of the first pattern matching the path.
+
+        :param path:
+            The path to the file under question.
+        :returns:
+            The index of the pattern or ``None`` if no pattern matches.
+        """
+        names = [os.path.abspath(path)]
+        basename = os.path.basename(path)
+        if basename not in {".", ".."}:
+            names.append(basename)
+        matches = [self.first_match_name(name) for name in names]
+        return min((m for m in matches if m is not None), default=None)
+
+
+@contextlib.contextmanager
+def timed(times: dict[str, float], name: str) -> Generator[None]:
+    """Add the seconds spent running the block to ``times[name]``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        times[name] = times.get(name, 0.0) + time.perf_counter() - start
+
+
 def get_python_version() -> str:
     """Find and format the python implementation and version.
 